@@ -0,0 +1,919 @@
+#!/usr/bin/env python3
+"""性能基准测试脚本
+
+用法:
+    python benchmark.py            # 运行全部基准
+    python benchmark.py parse      # 只运行指定基准
+"""
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.config import Config
+from src.parser import NewsParser, ENGINES
+from src.near_dedup import NearDuplicateDetector
+from src.models import NewsItem
+from src.rss_generator import RSSGenerator, HAS_FEEDGEN
+from src.html_generator import HTMLGenerator
+from src.renderer import RenderStage
+
+
+class BenchConfig:
+    """基准测试用的最小配置对象"""
+
+    def __init__(self, sources=None, parser_config=None, rss_config=None, data_dir="data",
+                 output_dir=None, render_config=None, html_config=None, fetcher_config=None):
+        self.config = {}
+        self.sources = sources or {}
+        self.parser_config = parser_config or {}
+        self.rss_config = rss_config or {}
+        self.render_config = render_config or {}
+        self.html_config = html_config or {}
+        self.fetcher_config = fetcher_config or {}
+        self.data_dir = data_dir
+        self.output_dir = output_dir or data_dir
+
+    def get_enabled_sources(self, category):
+        return self.sources.get(category, [])
+
+    def get_categories(self):
+        return list(self.sources)
+
+    def get_fetcher_config(self):
+        return self.fetcher_config
+
+    def get_storage_config(self):
+        return {'data_dir': self.data_dir}
+
+    def get_parser_config(self):
+        return self.parser_config
+
+    def get_rss_config(self):
+        return self.rss_config
+
+    def get_html_config(self):
+        return self.html_config
+
+    def get_render_config(self):
+        return self.render_config
+
+    def get_output_dirs(self):
+        return {
+            'data': self.data_dir,
+            'rss': str(Path(self.output_dir) / 'rss'),
+            'html': str(Path(self.output_dir) / 'docs')
+        }
+
+
+def make_page(index: int, items: int = 300, filler: int = 2000) -> str:
+    """生成模拟门户首页：若干新闻项 + 大量无关内容"""
+    parts = ['<html><head><script>var x = 1;</script><style>.a{color:red}</style></head><body>']
+    parts.append('<div class="nav">' + '<a href="/n">导航</a>' * filler + '</div>')
+    for i in range(items):
+        parts.append(
+            f'<div class="news-item"><a href="/p{index}/{i}">'
+            f'<span class="title">第{index}页新闻标题 {i}</span></a>'
+            f'<p class="summary">新闻摘要 {i} ' + '内容' * 20 + '</p></div>'
+        )
+    parts.append('<footer>' + '<p>页脚</p>' * filler + '</footer></body></html>')
+    return ''.join(parts)
+
+
+def make_sources(pages: int = 24):
+    """生成模拟的抓取结果和源配置"""
+    category_data = {}
+    sources_config = {}
+    for category in ['tech', 'finance', 'entertainment']:
+        category_data[category] = []
+        sources_config[category] = []
+        for i in range(pages // 3):
+            name = f"{category}-{i}"
+            category_data[category].append({
+                'name': name,
+                'url': f"https://{name}.example.com/",
+                'content': make_page(i),
+                'fetched_at': '2026-01-01T08:00:00',
+                'category': category
+            })
+            sources_config[category].append({
+                'name': name,
+                'url': f"https://{name}.example.com/",
+                'selector': '.news-item',
+                'link_selector': 'a',
+                'title_selector': '.title',
+                'desc_selector': '.summary'
+            })
+    return category_data, sources_config
+
+
+def bench_parse():
+    """串行解析 vs 进程池并行解析"""
+    category_data, sources_config = make_sources()
+    results = {}
+
+    for workers in [0, 2, 4]:
+        config = BenchConfig(sources_config, {'workers': workers})
+        parser = NewsParser()
+        start = time.perf_counter()
+        results[workers] = parser.parse_category_data(category_data, config)
+        elapsed = time.perf_counter() - start
+        parser.close()
+        label = "串行" if workers == 0 else f"{workers} 进程"
+        print(f"   {label}: {elapsed:.2f} 秒")
+
+    serial = [[item['link'] for item in items] for items in results[0].values()]
+    for workers in [2, 4]:
+        parallel = [[item['link'] for item in items] for items in results[workers].values()]
+        assert parallel == serial, "并行解析输出顺序与串行不一致"
+    print("   ✓ 输出顺序一致")
+
+
+def load_saved_pages(config_path: str = "config.yaml"):
+    """读取HTTP缓存中保存的页面，返回 [(源数据, 源配置)]"""
+    if not Path(config_path).exists():
+        return []
+
+    config = Config(config_path)
+    cache_dir = Path(config.get_output_dirs()['data']) / 'http_cache'
+    if not cache_dir.is_dir():
+        return []
+
+    sources = {
+        source['url']: dict(source, category=category)
+        for category in config.get_categories()
+        for source in config.get_news_sources(category)
+    }
+
+    pages = []
+    for path in cache_dir.glob('*.json'):
+        entry = json.loads(path.read_text(encoding='utf-8'))
+        source = sources.get(entry.get('url'))
+        if source and entry.get('content'):
+            source_data = {
+                'name': source['name'],
+                'url': source['url'],
+                'content': entry['content'],
+                'fetched_at': '2026-01-01T08:00:00',
+                'category': source['category']
+            }
+            pages.append((source_data, source))
+    return pages
+
+
+def bench_engines():
+    """解析引擎吞吐量与输出一致性"""
+    pages = load_saved_pages()
+    if pages:
+        print(f"   使用HTTP缓存中保存的 {len(pages)} 个页面")
+    else:
+        category_data, sources_config = make_sources()
+        pages = [
+            (source_data, source_config)
+            for category in category_data
+            for source_data, source_config in zip(category_data[category], sources_config[category])
+        ]
+        print(f"   未找到保存的页面，使用 {len(pages)} 个模拟页面")
+
+    # 子选择器也能匹配新闻项本身的页面：各引擎都只应在新闻项的后代中查找
+    self_matching = ''.join(
+        f'<div class="news-item summary"><a href="/d/{i}"><span class="title">标题 {i}</span></a>'
+        f'<p class="summary">摘要 {i}</p></div>'
+        f'<a class="news-item" href="/a/{i}"><span class="title">链接标题 {i}</span></a>'
+        for i in range(10)
+    )
+    pages.append((
+        {'name': 'self-matching', 'url': 'https://self-matching.example.com/',
+         'content': f'<html><body>{self_matching}</body></html>', 'fetched_at': '2026-01-01T08:00:00',
+         'category': 'tech'},
+        {'name': 'self-matching', 'url': 'https://self-matching.example.com/', 'selector': '.news-item',
+         'link_selector': 'a', 'title_selector': '.title', 'desc_selector': '.summary'}
+    ))
+
+    total_bytes = sum(len(source_data['content'].encode('utf-8')) for source_data, _ in pages)
+    outputs = {}
+
+    variants = [(engine, {'engine': engine}) for engine in ENGINES]
+    variants += [
+        (f"{engine} + SoupStrainer", {'engine': engine, 'restrict_tree': True})
+        for engine in ('html.parser', 'lxml')
+    ]
+
+    for label, options in variants:
+        parser = NewsParser(**options)
+        if parser.engine != options['engine']:
+            print(f"   {label}: 不可用，跳过")
+            continue
+
+        start = time.perf_counter()
+        outputs[label] = [
+            [(item['title'], item['link'], item['description']) for item in parser.parse_source(source_data, source_config)]
+            for source_data, source_config in pages
+        ]
+        elapsed = time.perf_counter() - start
+        print(f"   {label}: {elapsed:.2f} 秒，{total_bytes / elapsed / 1024 / 1024:.1f} MB/秒")
+
+    baseline = outputs['html.parser']
+    for label, output in outputs.items():
+        if label != 'html.parser':
+            status = "✓ 一致" if output == baseline else "✗ 不一致"
+            print(f"   {label} 与 html.parser 输出: {status}")
+
+
+def make_items(count: int, duplicate_ratio: float = 0.3, seed: int = 42):
+    """生成模拟新闻项，其中一部分是改写过标题的近似重复"""
+    rng = random.Random(seed)
+    words = ['科技', '财经', '发布', '市场', '公司', '融资', '芯片', '模型', '增长', '政策',
+             'AI', 'GPT', 'Apple', '特斯拉', '电动车', '上涨', '下跌', '季度', '财报', '用户']
+    items = []
+    for i in range(count):
+        if items and rng.random() < duplicate_ratio:
+            # 近似重复：原标题加上少量改动
+            base = rng.choice(items)['title']
+            title = base.replace(' ', rng.choice(['', '，', ' '])) + rng.choice(['', '！', '（更新）'])
+        else:
+            title = ' '.join(rng.choice(words) for _ in range(8)) + f" {i}"
+        items.append({
+            'id': str(i),
+            'title': title,
+            'link': f"https://example.com/{i}",
+            'description': title,
+            'source': f"source-{i % 20}",
+            'category': 'tech'
+        })
+    return items
+
+
+def bench_near_dedup():
+    """MinHash/LSH 近似去重"""
+    detector = NearDuplicateDetector()
+    for count in [1000, 10000, 30000]:
+        items = make_items(count)
+        start = time.perf_counter()
+        collapsed = detector.collapse([dict(item) for item in items])
+        elapsed = time.perf_counter() - start
+        print(f"   {count} 条: {elapsed:.2f} 秒，合并后 {len(collapsed)} 条")
+
+    # 签名相似度估计 Jaccard 相似度的误差：改写过少量词的标题对
+    rng = random.Random(7)
+    words = ['科技', '财经', '发布', '市场', '公司', '融资', '芯片', '模型', '增长', '政策',
+             'AI', 'GPT', 'Apple', '特斯拉', '电动车', '上涨', '下跌', '季度', '财报', '用户']
+    errors = []
+    for _ in range(500):
+        text_a = [rng.choice(words) for _ in range(8)]
+        text_b = list(text_a)
+        for _ in range(2):
+            text_b[rng.randrange(8)] = rng.choice(words)
+        text_a, text_b = ' '.join(text_a), ' '.join(text_b)
+        shingles_a, shingles_b = detector._shingles(text_a), detector._shingles(text_b)
+        jaccard = len(shingles_a & shingles_b) / len(shingles_a | shingles_b)
+        estimate = detector._similarity(detector.signature(text_a), detector.signature(text_b))
+        errors.append(abs(estimate - jaccard))
+    error = sum(errors) / len(errors)
+    assert error < 0.08, f"签名相似度误差过大: {error:.3f}"
+    print(f"   ✓ 签名相似度与 Jaccard 相似度的平均绝对误差 {error:.3f}（{len(errors)} 对）")
+
+    # 只差一个词的不同短标题不应被合并
+    headlines = [f"ETag 新闻 {i}" for i in range(10)] + [f"{city}今日天气晴" for city in ['北京', '上海', '广州', '深圳']]
+    short_items = [{'title': title, 'link': f"https://example.com/{i}"} for i, title in enumerate(headlines)]
+    assert len(detector.collapse(short_items)) == len(headlines), "不同的短标题被合并"
+    print(f"   ✓ {len(headlines)} 条只差一个词的短标题没有被合并")
+
+
+def bench_timestamps():
+    """预计算时间戳 vs 每个阶段重复解析ISO时间（10万条）"""
+    from datetime import timedelta
+    from src.utils import NewsUtils
+
+    base = datetime(2026, 1, 1, 8, 0, 0)
+    iso_times = [(base + timedelta(seconds=i * 7)).isoformat() for i in range(100000)]
+    parser = NewsParser()
+
+    def parse(value):
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+    # 旧流程：过滤、分类排序、总排序、RSS、HTML 各解析一次
+    items = [{'published_at': value} for value in iso_times]
+    start = time.perf_counter()
+    cutoff = parse(iso_times[0]).timestamp()
+    items = [item for item in items if parse(item['published_at']).timestamp() >= cutoff]
+    for _ in range(2):
+        items = sorted(items, key=lambda item: parse(item['published_at']), reverse=True)
+    for item in items:
+        parse(item['published_at'])
+        parse(item['published_at']).strftime('%Y-%m-%d %H:%M')
+    old_elapsed = time.perf_counter() - start
+
+    # 新流程：解析时计算一次，之后各阶段直接使用数值时间戳
+    items = [{'published_at': value} for value in iso_times]
+    start = time.perf_counter()
+    for item in items:
+        NewsUtils.item_timestamp(item)
+    items = [item for item in items if item['published_ts'] >= cutoff]
+    for _ in range(2):
+        items = parser.sort_items(items)
+    for item in items:
+        datetime.fromtimestamp(NewsUtils.item_timestamp(item)).strftime('%Y-%m-%d %H:%M')
+    new_elapsed = time.perf_counter() - start
+
+    print(f"   重复解析: {old_elapsed:.2f} 秒")
+    print(f"   预计算时间戳: {new_elapsed:.2f} 秒（{old_elapsed / new_elapsed:.1f}x）")
+
+
+def bench_item_memory(count: int = 1000000):
+    """新闻项内存占用：字典 vs NewsItem（100万条）"""
+    import gc
+    import tracemalloc
+
+    # 标题、链接等各条新闻独有的字符串两种表示都需要，预先生成，不计入测量
+    fetched_at = '2026-01-01T08:00:00'
+    published_ts = datetime.fromisoformat(fetched_at).timestamp()
+    titles = [f"新闻标题 {i}" for i in range(count)]
+    links = [f"https://example.com/news/{i}" for i in range(count)]
+    ids = [f"{i:016x}" for i in range(count)]
+
+    def make_dict(i):
+        # 模拟跨进程返回后的字典：来源、分类字符串每条各一份
+        return {
+            'id': ids[i],
+            'title': titles[i],
+            'link': links[i],
+            'description': titles[i],
+            'source': ''.join(['source-', str(i % 50)]),
+            'category': ''.join(['te', 'ch']),
+            'published_at': fetched_at,
+            'fetched_at': fetched_at,
+            'published_ts': published_ts
+        }
+
+    def make_item(i):
+        return NewsItem(
+            id=ids[i],
+            title=titles[i],
+            link=links[i],
+            description=titles[i],
+            source=''.join(['source-', str(i % 50)]),
+            category=''.join(['te', 'ch']),
+            published_ts=published_ts,
+            fetched_ts=published_ts
+        )
+
+    results = {}
+    for label, factory in [('字典', make_dict), ('NewsItem', make_item)]:
+        gc.collect()
+        tracemalloc.start()
+        items = [factory(i) for i in range(count)]
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[label] = size
+        print(f"   {label}: {size / 1024 / 1024:.0f} MB，每条 {size / count:.0f} 字节")
+        del items
+
+    print(f"   节省 {1 - results['NewsItem'] / results['字典']:.0%}")
+
+
+def _write_feed_worker(writer, fmt, count, output_dir, queue):
+    """子进程中生成订阅源，报告耗时和峰值内存增量"""
+    import gc
+    import resource
+
+    items = [
+        NewsItem(
+            id=f"{i:016x}",
+            title=f"新闻标题 {i} " + '标题' * 10,
+            link=f"https://example.com/news/{i}",
+            description='新闻摘要 ' + '内容' * 60,
+            source=f"source-{i % 50}",
+            category='tech',
+            published_ts=1767225600.0 - i * 60,
+            fetched_ts=1767225600.0
+        )
+        for i in range(count)
+    ]
+    gc.collect()
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    config = BenchConfig(rss_config={
+        'writer': writer,
+        'formats': [fmt],
+        'incremental': False
+    }, data_dir=output_dir)
+    generator = RSSGenerator(config)
+
+    start = time.perf_counter()
+    generator.write_feed('tech', items, output_dir)
+    elapsed = time.perf_counter() - start
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    queue.put((elapsed, peak))
+
+
+def bench_feed_writer():
+    """订阅源写入：feedgen vs 流式写入器（吞吐量与峰值内存）"""
+    import multiprocessing
+    import tempfile
+
+    variants = [('stream', 'rss'), ('stream', 'atom'), ('stream', 'json')]
+    if HAS_FEEDGEN:
+        variants.insert(0, ('feedgen', 'rss'))
+
+    # 每次在独立子进程中运行，峰值内存（ru_maxrss）互不影响
+    context = multiprocessing.get_context('fork')
+    for count in [1000, 10000, 50000]:
+        print(f"   max_items_per_feed = {count}:")
+        for writer, fmt in variants:
+            with tempfile.TemporaryDirectory() as output_dir:
+                queue = context.Queue()
+                process = context.Process(
+                    target=_write_feed_worker, args=(writer, fmt, count, output_dir, queue)
+                )
+                process.start()
+                elapsed, peak = queue.get()
+                process.join()
+            print(f"     {writer} / {fmt}: {elapsed:.2f} 秒，{count / elapsed:.0f} 条/秒，"
+                  f"峰值内存增加 {peak / 1024:.1f} MB")
+
+
+def bench_render():
+    """渲染阶段：逐个生成 vs 线程池并发生成"""
+    import asyncio
+    import tempfile
+
+    categories = [f"category{i}" for i in range(12)]
+    categorized_items = {
+        category: [
+            NewsItem(
+                id=f"{category}-{i}",
+                title=f"新闻标题 {i}",
+                link=f"https://example.com/{category}/{i}",
+                description='新闻摘要 ' + '内容' * 60,
+                source=f"source-{i % 10}",
+                category=category,
+                published_ts=1767225600.0 - i * 60,
+                fetched_ts=1767225600.0
+            )
+            for i in range(5000)
+        ]
+        for category in categories
+    }
+    rss_config = {'max_items_per_feed': 5000, 'incremental': False, 'formats': ['atom', 'json']}
+
+    for workers in [1, 4, 8]:
+        with tempfile.TemporaryDirectory() as output_dir:
+            config = BenchConfig(rss_config=rss_config, data_dir=output_dir, output_dir=output_dir,
+                                 render_config={'workers': workers})
+            stage = RenderStage(config, RSSGenerator(config), HTMLGenerator(config))
+            start = time.perf_counter()
+            asyncio.run(stage.run(categorized_items))
+            elapsed = time.perf_counter() - start
+        print(f"   {workers} 线程: {elapsed:.2f} 秒")
+
+
+def bench_pages():
+    """分页和归档页面：首次全量生成 vs 只有一个分类新增新闻或修正一条标题后的增量生成"""
+    import asyncio
+    import tempfile
+    from src.archive import NewsArchive
+
+    def make_items(category, count, offset=0):
+        return [
+            NewsItem(
+                id=f"{category}-{i}",
+                title=f"新闻标题 {i}",
+                link=f"https://example.com/{category}/{i}",
+                description='新闻摘要 ' + '内容' * 60,
+                source=f"source-{i % 10}",
+                category=category,
+                published_ts=1767225600.0 - i * 600,
+                fetched_ts=1767225600.0
+            )
+            for i in range(-offset, count)
+        ]
+
+    categories = [f"category{i}" for i in range(6)]
+    categorized_items = {category: make_items(category, 2000) for category in categories}
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        config = BenchConfig(rss_config={'incremental': True}, data_dir=output_dir, output_dir=output_dir,
+                             html_config={'max_items_per_page': 20})
+
+        for label in ['首次生成', '无变化', '一个分类新增10条', '修正一条标题']:
+            if label == '一个分类新增10条':
+                categorized_items['category0'] = make_items('category0', 2000, offset=10)
+            if label == '修正一条标题':
+                categorized_items['category1'][0].title = '新闻标题 0（更正）'
+            html_generator = HTMLGenerator(config)
+            archive = NewsArchive(str(Path(output_dir) / 'archive'))
+            archive.add(categorized_items)
+            archive.save()
+            stage = RenderStage(config, RSSGenerator(config), html_generator)
+            start = time.perf_counter()
+            asyncio.run(stage.run(categorized_items, archive))
+            elapsed = time.perf_counter() - start
+            report = html_generator.run_report
+            print(f"   {label}: {elapsed:.2f} 秒，重写 {len(report['rewritten'])} 个页面，"
+                  f"跳过 {len(report['unchanged'])} 个")
+
+
+def bench_compress():
+    """预压缩：压缩后的大小，不同线程数的耗时，以及无变化时的增量运行"""
+    import asyncio
+    import tempfile
+    from src.archive import NewsArchive
+    from src.compressor import OutputCompressor, HAS_BROTLI
+
+    categorized_items = {
+        f"category{c}": [
+            NewsItem(
+                id=f"category{c}-{i}",
+                title=f"新闻标题 {c}-{i}",
+                link=f"https://example.com/category{c}/{i}",
+                description=f"新闻摘要 {i} " + '内容' * 60,
+                source=f"source-{i % 10}",
+                category=f"category{c}",
+                published_ts=1767225600.0 - i * 600,
+                fetched_ts=1767225600.0
+            )
+            for i in range(1000)
+        ]
+        for c in range(6)
+    }
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        config = BenchConfig(rss_config={'max_items_per_feed': 1000, 'formats': ['atom', 'json']},
+                             data_dir=output_dir, output_dir=output_dir)
+        archive = NewsArchive(str(Path(output_dir) / 'archive'))
+        archive.add(categorized_items)
+        asyncio.run(RenderStage(config, RSSGenerator(config), HTMLGenerator(config)).run(categorized_items, archive))
+        directories = [config.get_output_dirs()['html'], config.get_output_dirs()['rss']]
+
+        print(f"   brotli: {'已安装' if HAS_BROTLI else '未安装，只生成 .gz'}")
+        for workers in [1, 4]:
+            config.render_config = {'workers': workers}
+            Path(output_dir, 'compress_state.json').unlink(missing_ok=True)
+            compressor = OutputCompressor(config)
+            start = time.perf_counter()
+            report = asyncio.run(compressor.run(directories))
+            print(f"   {workers} 线程: 压缩 {len(report['compressed'])} 个文件 {time.perf_counter() - start:.2f} 秒")
+
+        compressor = OutputCompressor(config)
+        start = time.perf_counter()
+        report = asyncio.run(compressor.run(directories))
+        print(f"   无变化: 压缩 {len(report['compressed'])} 个文件 {time.perf_counter() - start:.3f} 秒")
+
+        for suffix in ['.gz', '.br']:
+            compressed = list(Path(output_dir).rglob(f"*{suffix}"))
+            if compressed:
+                original = sum(path.with_name(path.name[:-len(suffix)]).stat().st_size for path in compressed)
+                size = sum(path.stat().st_size for path in compressed)
+                print(f"   {suffix}: {original / 1024:.0f} KB -> {size / 1024:.0f} KB ({size / original:.1%})")
+
+
+async def start_local_server(handle):
+    """在随机端口上启动本地HTTP服务器，返回 (runner, 端口)"""
+    from aiohttp import web
+
+    app = web.Application()
+    app.router.add_get('/{name}', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+def bench_circuit():
+    """熔断和自适应超时：本地服务器上一个源持续出错、一个源偶尔卡住时的每次运行耗时"""
+    import asyncio
+    import logging
+    import tempfile
+    from aiohttp import web
+    from src.fetcher import NewsFetcher
+
+    stalls = {'count': 0}
+
+    async def handle(request):
+        name = request.match_info['name']
+        if name == 'broken':
+            return web.Response(status=503)
+        if name == 'flaky':
+            # 每六次请求卡住一次（超过自适应超时，但小于配置的 timeout）
+            stalls['count'] += 1
+            await asyncio.sleep(8 if stalls['count'] % 6 == 0 else 0.05)
+        return web.Response(text='<div class="item"><a href="/a">新闻</a></div>', content_type='text/html')
+
+    async def run(circuit_enabled):
+        runner, port = await start_local_server(handle)
+
+        sources = {'tech': [
+            {'name': name, 'url': f"http://127.0.0.1:{port}/{name}", 'selector': '.item'}
+            for name in ['ok1', 'ok2', 'flaky', 'broken']
+        ]}
+        fetcher_config = {
+            'timeout': 10, 'retry_times': 2, 'delay_between_requests': 0, 'http_cache': False,
+            'circuit_breaker': {'enabled': circuit_enabled},
+            'adaptive_timeout': {'enabled': circuit_enabled, 'min_timeout': 0.5}
+        }
+        elapsed = []
+        with tempfile.TemporaryDirectory() as data_dir:
+            config = BenchConfig(sources=sources, data_dir=data_dir, fetcher_config=fetcher_config)
+            for _ in range(8):
+                fetcher = NewsFetcher(config)
+                fetcher.logger.setLevel(logging.CRITICAL)
+                start = time.perf_counter()
+                await fetcher.fetch_all()
+                elapsed.append(time.perf_counter() - start)
+        await runner.cleanup()
+        return elapsed
+
+    logging.getLogger('src.source_health').setLevel(logging.ERROR)
+    for label, enabled in [('固定超时、无熔断', False), ('熔断 + 自适应超时', True)]:
+        stalls['count'] = 0
+        elapsed = asyncio.run(run(enabled))
+        print(f"   {label}: 每次运行 {' '.join(f'{t:.1f}' for t in elapsed)} 秒，合计 {sum(elapsed):.1f} 秒")
+
+
+def bench_hedging():
+    """对冲请求和运行截止时间：一个源偶发长尾延迟、一个源完全卡住时的每次运行耗时"""
+    import asyncio
+    import logging
+    import tempfile
+    from aiohttp import web
+    from src.fetcher import NewsFetcher
+
+    requests = {'count': 0}
+
+    async def handle(request):
+        name = request.match_info['name']
+        if name == 'stuck':
+            await asyncio.sleep(60)
+        elif name == 'tail':
+            # 每八次请求有一次长尾延迟
+            requests['count'] += 1
+            await asyncio.sleep(5 if requests['count'] % 8 == 0 else 0.05)
+        return web.Response(text='<div class="item"><a href="/a">新闻</a></div>', content_type='text/html')
+
+    async def run(fetcher_overrides, with_stuck, runs):
+        runner, port = await start_local_server(handle)
+        names = ['ok', 'tail'] + (['stuck'] if with_stuck else [])
+        sources = {'tech': [
+            {'name': name, 'url': f"http://127.0.0.1:{port}/{name}", 'selector': '.item'} for name in names
+        ]}
+        fetcher_config = dict({
+            'timeout': 30, 'retry_times': 0, 'delay_between_requests': 0, 'http_cache': False,
+            'max_per_host': 4, 'adaptive_timeout': {'enabled': False}
+        }, **fetcher_overrides)
+        elapsed, hedged, cut_off = [], 0, 0
+        with tempfile.TemporaryDirectory() as data_dir:
+            config = BenchConfig(sources=sources, data_dir=data_dir, fetcher_config=fetcher_config)
+            for _ in range(runs):
+                fetcher = NewsFetcher(config)
+                start = time.perf_counter()
+                stats = (await fetcher.fetch_all())['stats']
+                elapsed.append(time.perf_counter() - start)
+                hedged += stats['hedged_requests']
+                cut_off += len(stats['cut_off_sources'])
+        await runner.cleanup()
+        return elapsed, hedged, cut_off
+
+    logging.getLogger('src.fetcher').setLevel(logging.CRITICAL)
+    cases = [
+        ('长尾源，无对冲', {}, False),
+        ('长尾源，p90 对冲', {'hedging': {'enabled': True, 'percentile': 90, 'min_delay': 0.2}}, False),
+        ('卡住的源，无截止时间（timeout 10 秒）', {'timeout': 10}, True),
+        ('卡住的源，截止时间 2 秒', {'timeout': 10, 'deadline': 2}, True),
+    ]
+    for label, overrides, with_stuck in cases:
+        requests['count'] = 0
+        elapsed, hedged, cut_off = asyncio.run(run(overrides, with_stuck, runs=4 if with_stuck else 24))
+        print(f"   {label}: 合计 {sum(elapsed):.1f} 秒，最慢一次 {max(elapsed):.1f} 秒，"
+              f"对冲 {hedged} 次，截断 {cut_off} 个源")
+
+
+def bench_daemon():
+    """常驻模式：每次冷启动进程运行 vs 常驻进程中的热运行（本地服务器，30 个源）"""
+    import asyncio
+    import logging
+    import os
+    import subprocess
+    import tempfile
+    import yaml
+    from aiohttp import web
+    from src.daemon import NewsDaemon
+
+    async def handle(request):
+        name = request.match_info['name']
+        body = ''.join(
+            f'<div class="item"><a href="/{name}/{i}"><span class="title">{name} 新闻 {i}</span></a></div>'
+            for i in range(20)
+        )
+        return web.Response(text=body, content_type='text/html')
+
+    async def run(work_dir):
+        runner, port = await start_local_server(handle)
+        sources = {
+            category: [
+                {'name': f"{category}{i}", 'url': f"http://127.0.0.1:{port}/{category}{i}",
+                 'selector': '.item', 'link_selector': 'a', 'title_selector': '.title'}
+                for i in range(10)
+            ]
+            for category in ['tech', 'finance', 'entertainment']
+        }
+        config_path = Path(work_dir) / 'config.yaml'
+        with open(config_path, 'w', encoding='utf-8') as f:
+            yaml.safe_dump({
+                'schedule': [{'cron': '0 0 * * *'}],
+                'news_sources': sources,
+                'rss': {'output_dir': str(Path(work_dir) / 'rss')},
+                'html': {'output_dir': str(Path(work_dir) / 'docs')},
+                'storage': {'data_dir': str(Path(work_dir) / 'data')},
+                # 只比较启动开销，不错峰
+                'fetcher': {'delay_between_requests': 0, 'stagger_window': 0},
+                'logging': {'file': str(Path(work_dir) / 'logs' / 'bench.log'), 'level': 'ERROR'}
+            }, f, allow_unicode=True)
+
+        # 冷启动：每次运行一个新进程（导入依赖、读配置、建立连接）
+        cold = []
+        script = Path(__file__).parent / 'run.py'
+        for _ in range(3):
+            start = time.perf_counter()
+            await asyncio.to_thread(
+                subprocess.run, [sys.executable, str(script), str(config_path)],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=work_dir, check=True
+            )
+            cold.append(time.perf_counter() - start)
+
+        # 常驻：同一进程中连续运行
+        daemon = NewsDaemon(str(config_path))
+        warm = []
+        for _ in range(3):
+            start = time.perf_counter()
+            await daemon.run_once()
+            warm.append(time.perf_counter() - start)
+        await daemon._close_components()
+        await runner.cleanup()
+        return cold, warm
+
+    logging.disable(logging.INFO)
+    stdout = sys.stdout
+    with tempfile.TemporaryDirectory() as work_dir:
+        sys.stdout = open(os.devnull, 'w')
+        try:
+            cold, warm = asyncio.run(run(work_dir))
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+    logging.disable(logging.NOTSET)
+    print(f"   冷启动进程: {' '.join(f'{t:.2f}' for t in cold)} 秒")
+    print(f"   常驻热运行: {' '.join(f'{t:.2f}' for t in warm)} 秒")
+
+
+def bench_polling():
+    """自适应轮询：模拟一天内每10分钟运行一次，源的更新周期从5分钟到1天不等"""
+    import tempfile
+    import zlib
+    from src.poll_scheduler import PollScheduler
+
+    # 源名称 -> 更新周期（秒）
+    periods = {'every5m': 300, 'every30m': 1800, 'hourly': 3600, 'every6h': 21600, 'daily': 86400}
+    periods = {f"{name}-{i}": period for name, period in periods.items() for i in range(4)}
+    tick, duration = 600, 86400
+
+    def simulate(enabled):
+        with tempfile.TemporaryDirectory() as data_dir:
+            scheduler = PollScheduler(str(Path(data_dir) / 'poll_state.json'), {'enabled': enabled})
+            polls = 0
+            detected = {name: 0 for name in periods}  # 已发现的版本号
+            staleness = []
+            for now in range(0, duration, tick):
+                for name, period in periods.items():
+                    # 不同源的更新时刻错开
+                    offset = zlib.crc32(name.encode('utf-8')) % period
+                    version = (now + offset) // period
+                    if not scheduler.is_due(name, now):
+                        continue
+                    polls += 1
+                    scheduler.record(name, str(version), now)
+                    if version != detected[name]:
+                        # 新版本从发布到被发现的延迟
+                        published = version * period - offset
+                        staleness.append(now - published)
+                        detected[name] = version
+            return polls, sum(staleness) / len(staleness) if staleness else 0
+
+    for label, enabled in [('固定轮询', False), ('自适应轮询', True)]:
+        polls, staleness = simulate(enabled)
+        print(f"   {label}: 请求 {polls} 次，更新被发现的平均延迟 {staleness / 60:.1f} 分钟")
+
+
+def bench_fingerprint():
+    """内容指纹：本地服务器上的源不支持条件请求，页面不变或少数变化时再次运行的解析耗时；分块边界不影响指纹"""
+    import asyncio
+    import logging
+    import tempfile
+    from aiohttp import web
+    from src.fetcher import NewsFetcher
+
+    names = [f"source-{i}" for i in range(12)]
+    versions = {name: 0 for name in names}
+
+    async def handle(request):
+        name = request.match_info['name']
+        # 不返回 ETag / Last-Modified，只能靠内容指纹判断是否变化
+        return web.Response(text=make_page(names.index(name) + 100 * versions[name]), content_type='text/html')
+
+    async def run():
+        runner, port = await start_local_server(handle)
+        sources = {'tech': [
+            {'name': name, 'url': f"http://127.0.0.1:{port}/{name}", 'selector': '.news-item',
+             'link_selector': 'a', 'title_selector': '.title', 'desc_selector': '.summary'}
+            for name in names
+        ]}
+        fetcher_config = {'timeout': 30, 'retry_times': 0, 'delay_between_requests': 0,
+                          'adaptive_polling': {'enabled': False}}
+
+        with tempfile.TemporaryDirectory() as data_dir:
+            config = BenchConfig(sources=sources, data_dir=data_dir, fetcher_config=fetcher_config)
+            fetcher = NewsFetcher(config)
+            fetcher.logger.setLevel(logging.CRITICAL)
+            parser = NewsParser(cache=fetcher.http_cache)
+            parser.logger.setLevel(logging.CRITICAL)
+
+            for label, changed in [('首次运行', 0), ('页面均未变化', 0), ('四分之一页面变化', len(names) // 4)]:
+                for name in names[:changed]:
+                    versions[name] += 1
+                results = await fetcher.fetch_all()
+                start = time.perf_counter()
+                items = parser.parse_all(results['categories']['tech'], sources['tech'])
+                elapsed = time.perf_counter() - start
+                print(f"   {label}: 解析 {elapsed:.2f} 秒，{len(items)} 条，"
+                      f"复用 {len(results['stats']['unchanged_sources'])}/{len(names)} 个源")
+            await fetcher.close_session()
+        await runner.cleanup()
+
+    asyncio.run(run())
+
+    # 同一页面按不同的分块大小到达时，保留的正文和指纹应完全相同
+    class ChunkedResponse:
+        charset = 'utf-8'
+
+        def __init__(self, body, chunk_size):
+            self.content = self
+            self.body = body
+            self.chunk_size = chunk_size
+
+        async def iter_chunked(self, _):
+            for start in range(0, len(self.body), self.chunk_size):
+                yield self.body[start:start + self.chunk_size]
+
+    async def read_all(body, source):
+        with tempfile.TemporaryDirectory() as data_dir:
+            fetcher = NewsFetcher(BenchConfig(data_dir=data_dir, fetcher_config={'http_cache': False}))
+            return [
+                await fetcher._read_body(ChunkedResponse(body, chunk_size), 'bench', source)
+                for chunk_size in (1, 7, 1000, 4096, 65536, len(body))
+            ]
+
+    body = make_page(0).encode('utf-8')
+    source = {'name': 'bench', 'stop_marker': '<footer'}
+    results = asyncio.run(read_all(body, source))
+    assert len(set(results)) == 1, "分块边界不同导致正文或指纹不一致"
+    assert results[0][0].endswith('<footer'), "正文没有截止到标记末尾"
+    print(f"   ✓ 6 种分块大小下 stop_marker 截止的正文和指纹一致（保留 {len(results[0][0])} 个字符）")
+
+
+BENCHMARKS = {
+    'parse': bench_parse,
+    'engines': bench_engines,
+    'near_dedup': bench_near_dedup,
+    'timestamps': bench_timestamps,
+    'item_memory': bench_item_memory,
+    'feed_writer': bench_feed_writer,
+    'render': bench_render,
+    'pages': bench_pages,
+    'compress': bench_compress,
+    'circuit': bench_circuit,
+    'hedging': bench_hedging,
+    'daemon': bench_daemon,
+    'polling': bench_polling,
+    'fingerprint': bench_fingerprint,
+}
+
+
+def main():
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for index, name in enumerate(names, 1):
+        bench = BENCHMARKS[name]
+        print(f"\n{index}. {bench.__doc__}...")
+        bench()
+
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.INFO)
+    main()
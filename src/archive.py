@@ -0,0 +1,125 @@
+"""新闻归档模块"""
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List, Set
+
+from .models import NewsItem
+from .utils import NewsUtils
+
+
+class NewsArchive:
+    """按日期分区的新闻归档
+
+    每天一个 JSON 文件（data_dir/archive/YYYY-MM-DD.json），按新闻ID保存当天发布的新闻；
+    另有 index.json 记录每天的新闻数，生成归档目录页时无需读取所有日期的文件。
+    每次运行只读写本次新闻涉及的日期，历史再长，运行开销也不随之增长。
+    """
+
+    def __init__(self, archive_dir: str):
+        self.archive_dir = Path(archive_dir)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+
+        self.index_file = self.archive_dir / 'index.json'
+        # 日期 -> 新闻数
+        self.index: Dict[str, int] = {}
+        if self.index_file.exists():
+            self.index = NewsUtils.load_json_file(str(self.index_file))
+
+        # 已读入内存的日期：日期 -> {新闻ID: 新闻}
+        self._days: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._dirty: Set[str] = set()
+
+        # 本次运行中新增了新闻的日期和被淘汰的日期，生成页面时据此增量更新
+        self.changed_days: Set[str] = set()
+        self.expired_days: List[str] = []
+
+    @staticmethod
+    def item_day(item: Dict[str, Any]) -> str:
+        """新闻所属日期（本地时间）"""
+        timestamp = NewsUtils.item_timestamp(item)
+        if timestamp is None:
+            timestamp = item.get('fetched_ts') or datetime.now().timestamp()
+        return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')
+
+    def _day_path(self, day: str) -> Path:
+        return self.archive_dir / f"{day}.json"
+
+    def _load_day(self, day: str) -> Dict[str, Dict[str, Any]]:
+        """读取某天的归档（进程内只读一次磁盘）"""
+        if day not in self._days:
+            path = self._day_path(day)
+            self._days[day] = NewsUtils.load_json_file(str(path)) if path.exists() else {}
+        return self._days[day]
+
+    def add(self, categorized_items: Dict[str, List[Dict[str, Any]]]) -> Set[str]:
+        """归档新闻，返回新增或更新了新闻的日期"""
+        changed = set()
+
+        for items in categorized_items.values():
+            for item in items:
+                item_id = item.get('id') or NewsUtils.stable_id(item.get('link', ''))
+                day = self.item_day(item)
+                records = self._load_day(day)
+
+                data = item.to_dict() if isinstance(item, NewsItem) else dict(item)
+                data['id'] = item_id
+                # 已归档的新闻只在内容有变化（如标题修正、新增"另见"链接）时更新
+                if records.get(item_id) == data:
+                    continue
+                records[item_id] = data
+                changed.add(day)
+
+        for day in changed:
+            self.index[day] = len(self._days[day])
+        self._dirty |= changed
+        self.changed_days |= changed
+
+        if changed:
+            self.logger.info(f"归档有变化的日期: {sorted(changed)}")
+        return changed
+
+    def get_day(self, day: str) -> Dict[str, List[NewsItem]]:
+        """某天的新闻，按分类分组，组内按发布时间倒序"""
+        categorized = {}
+        for data in self._load_day(day).values():
+            item = NewsItem.from_dict(data)
+            categorized.setdefault(item.category, []).append(item)
+
+        for items in categorized.values():
+            items.sort(key=lambda item: NewsUtils.item_timestamp(item) or 0, reverse=True)
+        return categorized
+
+    def days(self) -> List[str]:
+        """所有归档日期，新的在前"""
+        return sorted(self.index, reverse=True)
+
+    def evict(self, keep_days: int) -> List[str]:
+        """删除超过 keep_days 天的归档，返回被删除的日期；keep_days 为 0 表示永久保留"""
+        if keep_days <= 0:
+            return []
+
+        cutoff = (datetime.now() - timedelta(days=keep_days)).strftime('%Y-%m-%d')
+        expired = [day for day in self.index if day < cutoff]
+        for day in expired:
+            self._day_path(day).unlink(missing_ok=True)
+            self.index.pop(day, None)
+            self._days.pop(day, None)
+            self._dirty.discard(day)
+
+        if expired:
+            NewsUtils.save_json_file(self.index, str(self.index_file))
+            self.logger.info(f"已删除 {len(expired)} 天的过期归档")
+        self.expired_days.extend(expired)
+        return expired
+
+    def save(self):
+        """保存有变化的日期和索引"""
+        if not self._dirty:
+            return
+
+        for day in self._dirty:
+            NewsUtils.save_json_file(self._days[day], str(self._day_path(day)), indent=None)
+        NewsUtils.save_json_file(self.index, str(self.index_file))
+        self._dirty.clear()
@@ -0,0 +1,167 @@
+"""预压缩输出模块"""
+import asyncio
+import gzip
+import hashlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from .utils import NewsUtils
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+
+class OutputCompressor:
+    """为生成的HTML和RSS文件写入预压缩副本
+
+    每个文件旁边写一个 .gz（以及安装了 brotli 时的 .br），配合 nginx 的 gzip_static /
+    brotli_static 直接发送，服务器不必在请求时压缩。压缩在线程池中并发执行（zlib 和 brotli
+    压缩时释放GIL）；文件大小和修改时间未变、或内容哈希未变的文件不会重新压缩。
+    """
+
+    # 需要压缩的文件类型
+    EXTENSIONS = ('.html', '.xml', '.json', '.css')
+
+    # 压缩格式 -> 副本后缀
+    SUFFIXES = {'gzip': '.gz', 'brotli': '.br'}
+
+    def __init__(self, config: Any):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+
+        render_config = config.get_render_config()
+        compression_config = render_config.get('compression', {})
+        self.enabled = compression_config.get('enabled', True)
+        self.workers = render_config.get('workers', 4)
+        self.min_size = compression_config.get('min_size', 256)
+        self.gzip_level = compression_config.get('gzip_level', 9)
+        self.brotli_quality = compression_config.get('brotli_quality', 11)
+
+        self.formats = []
+        for fmt in compression_config.get('formats', ['gzip', 'brotli']):
+            if fmt not in self.SUFFIXES:
+                self.logger.warning(f"忽略不支持的压缩格式: {fmt}")
+            elif fmt == 'brotli' and not HAS_BROTLI:
+                self.logger.info("未安装 brotli，只生成 gzip 副本")
+            else:
+                self.formats.append(fmt)
+
+        # 各文件上次压缩时的状态（路径 -> 内容哈希、大小、修改时间）
+        self.state_file = Path(config.get_output_dirs()['data']) / 'compress_state.json'
+        self.state: Dict[str, Dict[str, Any]] = {}
+        if self.state_file.exists():
+            self.state = NewsUtils.load_json_file(str(self.state_file))
+
+        # 本次运行报告
+        self.run_report: Dict[str, List[str]] = {'compressed': [], 'unchanged': [], 'removed': []}
+
+    def _sibling(self, path: Path, fmt: str) -> Path:
+        return path.with_name(path.name + self.SUFFIXES[fmt])
+
+    def _candidates(self, directories: List[str]) -> List[Path]:
+        """目录下所有需要压缩的文件（跳过原子写入产生的临时文件）"""
+        files = set()
+        for directory in directories:
+            root = Path(directory)
+            if not root.exists():
+                continue
+            for path in root.rglob('*'):
+                if path.suffix in self.EXTENSIONS and not path.name.startswith('.') and path.is_file():
+                    files.add(path)
+        return sorted(files)
+
+    def _remove_orphans(self, directories: List[str]):
+        """删除源文件已不存在的压缩副本（例如被删除的分页和归档页面）"""
+        for directory in directories:
+            root = Path(directory)
+            if not root.exists():
+                continue
+            for suffix in self.SUFFIXES.values():
+                for path in root.rglob(f"*{suffix}"):
+                    source = path.with_name(path.name[:-len(suffix)])
+                    if not source.exists():
+                        path.unlink(missing_ok=True)
+                        self.state.pop(source.as_posix(), None)
+                        self.run_report['removed'].append(path.as_posix())
+
+    def _compress(self, data: bytes, fmt: str) -> bytes:
+        if fmt == 'gzip':
+            # mtime 固定为0，相同内容的压缩结果完全相同
+            return gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+        return brotli.compress(data, quality=self.brotli_quality)
+
+    def _compress_file(self, path: Path) -> Tuple[str, Optional[Dict[str, Any]], bool]:
+        """压缩单个文件（在线程池中执行），返回 (路径, 新状态, 是否重新压缩)"""
+        key = path.as_posix()
+        previous = self.state.get(key)
+        stat = path.stat()
+        siblings = [self._sibling(path, fmt) for fmt in self.formats]
+
+        if stat.st_size < self.min_size:
+            # 太小的文件压缩收益不大；删除旧副本，避免发送过期内容
+            for sibling in siblings:
+                sibling.unlink(missing_ok=True)
+            return key, None, False
+
+        siblings_exist = all(sibling.exists() for sibling in siblings)
+        if (previous and siblings_exist and previous.get('formats') == self.formats
+                and previous['size'] == stat.st_size and previous['mtime_ns'] == stat.st_mtime_ns):
+            return key, previous, False
+
+        data = path.read_bytes()
+        content_hash = hashlib.sha1(data).hexdigest()
+        entry = {
+            'hash': content_hash,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'formats': self.formats
+        }
+
+        # 文件被重写但内容相同（或只是修改时间变了）
+        if previous and siblings_exist and previous.get('formats') == self.formats \
+                and previous['hash'] == content_hash:
+            return key, entry, False
+
+        for fmt, sibling in zip(self.formats, siblings):
+            with NewsUtils.atomic_write(str(sibling), mode='wb') as f:
+                f.write(self._compress(data, fmt))
+        return key, entry, True
+
+    async def run(self, directories: List[str]) -> Dict[str, List[str]]:
+        """压缩目录下所有生成的文件，返回运行报告"""
+        if not self.enabled or not self.formats:
+            return self.run_report
+
+        start_time = time.time()
+        self._remove_orphans(directories)
+        files = self._candidates(directories)
+
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=max(self.workers, 1), thread_name_prefix='compress') as executor:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(executor, self._compress_file, path) for path in files
+            ))
+
+        state = {}
+        for key, entry, compressed in results:
+            if entry is None:
+                continue
+            state[key] = entry
+            self.run_report['compressed' if compressed else 'unchanged'].append(key)
+
+        if state != self.state:
+            self.state = state
+            NewsUtils.save_json_file(self.state, str(self.state_file), indent=None)
+
+        self.logger.info(
+            f"预压缩完成: 压缩 {len(self.run_report['compressed'])} 个文件，"
+            f"未变化 {len(self.run_report['unchanged'])} 个，"
+            f"耗时 {time.time() - start_time:.2f} 秒"
+        )
+        return self.run_report
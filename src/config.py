@@ -52,6 +52,14 @@ class Config:
         """获取抓取器配置"""
         return self.config.get('fetcher', {})
     
+    def get_parser_config(self) -> Dict[str, Any]:
+        """获取解析器配置"""
+        return self.config.get('parser', {})
+    
+    def get_render_config(self) -> Dict[str, Any]:
+        """获取渲染配置"""
+        return self.config.get('render', {})
+    
     def get_notifications_config(self) -> Dict[str, Any]:
         """获取通知配置"""
         return self.config.get('notifications', {})
@@ -0,0 +1,166 @@
+"""常驻运行模块"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+from zoneinfo import ZoneInfo
+
+from .config import Config
+from .fetcher import NewsFetcher
+from .html_generator import refresh_templates
+from .scheduler import CronExpression, next_run_time
+
+
+class NewsDaemon:
+    """常驻进程：按 schedule 中的 cron 表达式定时运行聚合流程
+
+    进程只启动一次，依赖库只导入一次；抓取器（连接池、DNS缓存、HTTP缓存、源健康状态）
+    和解析器（解析进程池）在多次运行间保持。等待期间定期检查配置文件的修改时间，
+    文件变化时调用 Config.reload 重新加载，并按新配置重建抓取器和解析器、重新计算调度；
+    每次运行前检查模板文件，修改过的模板会重新编译。
+    """
+
+    def __init__(self, config_path: str = "config.yaml"):
+        self.config_path = Path(config_path)
+        self.config = Config(config_path)
+        self.logger = logging.getLogger(__name__)
+
+        self.fetcher: Optional[NewsFetcher] = None
+        self.parser = None
+        self._config_mtime = self._read_mtime()
+        self.schedules = self._load_schedules()
+
+    @property
+    def daemon_config(self):
+        return self.config.config.get('daemon', {})
+
+    def _read_mtime(self) -> Optional[float]:
+        try:
+            return self.config_path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _load_schedules(self) -> List[CronExpression]:
+        """解析 schedule 配置（每项为 {cron: "..."} 或 cron 字符串）"""
+        schedules = []
+        for entry in self.config.get_schedule() or []:
+            expression = entry.get('cron') if isinstance(entry, dict) else entry
+            if not expression:
+                continue
+            try:
+                schedules.append(CronExpression(expression))
+            except ValueError as e:
+                self.logger.error(f"忽略无效的调度配置: {e}")
+        return schedules
+
+    def _timezone(self) -> ZoneInfo:
+        """cron 表达式所用的时区（默认 UTC，与 GitHub Actions 一致）"""
+        return ZoneInfo(self.daemon_config.get('timezone', 'UTC'))
+
+    def _build_components(self):
+        """创建常驻的抓取器和解析器"""
+        from .main import create_parser
+
+        self.fetcher = NewsFetcher(self.config)
+        # 连接池跨运行保持
+        self.fetcher.keep_session = True
+        # 常驻模式默认错峰，避免每次调度时同时请求所有源（fetcher.stagger_window 显式配置时以其为准）
+        if 'stagger_window' not in self.config.get_fetcher_config():
+            self.fetcher.stagger_window = self.daemon_config.get('stagger_window', 60)
+        self.parser = create_parser(self.config, self.fetcher)
+
+    async def _close_components(self):
+        if self.parser is not None:
+            self.parser.close()
+            self.parser = None
+        if self.fetcher is not None:
+            await self.fetcher.close_session()
+            self.fetcher = None
+
+    async def check_reload(self) -> bool:
+        """配置文件有变化时重新加载，返回是否重新加载"""
+        mtime = self._read_mtime()
+        if mtime is None or mtime == self._config_mtime:
+            return False
+        self._config_mtime = mtime
+
+        # 先验证新配置，无效时继续使用当前配置
+        try:
+            candidate = Config(str(self.config_path))
+        except Exception as e:
+            self.logger.error(f"配置文件读取失败，继续使用当前配置: {e}")
+            return False
+        if not candidate.validate():
+            self.logger.error("配置文件验证失败，继续使用当前配置")
+            return False
+
+        self.config.reload()
+        self.schedules = self._load_schedules()
+        await self._close_components()
+        self.logger.info(f"配置文件已变化，已重新加载: {self.config_path}")
+        return True
+
+    async def run_once(self) -> bool:
+        """执行一次聚合流程"""
+        from .main import run_pipeline
+
+        await self.check_reload()
+        if self.fetcher is None:
+            self._build_components()
+        # 模板环境跨运行复用，模板文件修改后需要重新编译
+        refresh_templates()
+
+        self.config.create_directories()
+        started = time.time()
+        try:
+            success = await run_pipeline(self.config, fetcher=self.fetcher, parser=self.parser)
+        except Exception as e:
+            self.logger.error(f"运行异常: {e}", exc_info=True)
+            success = False
+        self.logger.info(f"本次运行{'完成' if success else '失败'}，耗时 {time.time() - started:.2f} 秒")
+        return success
+
+    def next_run(self) -> Optional[datetime]:
+        """下一次运行时刻（没有有效的调度配置时返回 None）"""
+        if not self.schedules:
+            return None
+        return next_run_time(self.schedules, datetime.now(self._timezone()))
+
+    async def _sleep_until(self, moment: datetime) -> bool:
+        """等待到指定时刻；期间配置文件变化时提前返回 False，以便重新计算调度"""
+        check_interval = self.daemon_config.get('reload_check_interval', 30)
+        while True:
+            remaining = (moment - datetime.now(moment.tzinfo)).total_seconds()
+            if remaining <= 0:
+                return True
+            await asyncio.sleep(min(remaining, check_interval))
+            if await self.check_reload():
+                return False
+
+    async def serve(self, run_immediately: bool = False) -> bool:
+        """常驻运行，直到进程被中断"""
+        from .main import setup_logging
+
+        if not self.config.validate():
+            print("配置验证失败，请检查配置文件")
+            return False
+        setup_logging(self.config)
+
+        self.logger.info(f"常驻模式启动，调度: {[schedule.expression for schedule in self.schedules]}")
+        try:
+            if run_immediately:
+                await self.run_once()
+
+            while True:
+                moment = self.next_run()
+                if moment is None:
+                    self.logger.error("schedule 中没有有效的 cron 表达式，常驻模式退出")
+                    return False
+
+                self.logger.info(f"下一次运行: {moment.isoformat()}")
+                if await self._sleep_until(moment):
+                    await self.run_once()
+        finally:
+            await self._close_components()
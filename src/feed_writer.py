@@ -0,0 +1,168 @@
+"""流式订阅源写入模块"""
+import json
+import re
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, Any, Iterable, TextIO, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+from .utils import NewsUtils
+
+# XML 1.0 不允许出现的控制字符（抓取的文本中偶尔会混入）
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+
+def _clean(text: Any) -> str:
+    """去除非法字符后转义为XML文本"""
+    return escape(_INVALID_XML_CHARS.sub('', str(text or '')))
+
+
+def _attr(text: Any) -> str:
+    """转义为带引号的XML属性值"""
+    return quoteattr(_INVALID_XML_CHARS.sub('', str(text or '')))
+
+
+class StreamingFeedWriter:
+    """流式订阅源写入器
+
+    不构建完整的文档对象树，每条新闻格式化后直接写入临时文件，全部写完后
+    原子替换目标文件；内存占用与条目数无关。支持 RSS 2.0、Atom 1.0 和 JSON Feed 1.1。
+    """
+
+    # 格式 -> 文件扩展名
+    EXTENSIONS = {'rss': '.xml', 'atom': '.atom.xml', 'json': '.json'}
+
+    def __init__(self, info: Dict[str, Any]):
+        """info: 订阅源信息，包括 id / feed_url / title / link / description / language / author / ttl / category / last_build"""
+        self.info = info
+
+    def write(self, filepath: str, items: Iterable[Dict[str, Any]], fmt: str = 'rss') -> int:
+        """把新闻写入订阅源文件，返回写入的条目数"""
+        if fmt not in self.EXTENSIONS:
+            raise ValueError(f"不支持的订阅源格式: {fmt}")
+
+        writer = getattr(self, f"_write_{fmt}")
+        with NewsUtils.atomic_write(filepath) as f:
+            return writer(f, items)
+
+    def _entry(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """提取条目字段（与 feedgen 版本的 add_entry 取值一致）"""
+        published = None
+        if item.get('published_at'):
+            published_ts = NewsUtils.item_timestamp(item)
+            if published_ts is None:
+                published_ts = datetime.now().timestamp()
+            published = datetime.fromtimestamp(published_ts, timezone.utc)
+
+        return {
+            'id': item.get('id'),
+            'title': item.get('title', '无标题'),
+            'link': item.get('link', ''),
+            'description': item.get('description', ''),
+            'source': item.get('source', 'Unknown'),
+            'published': published
+        }
+
+    def _last_build(self) -> datetime:
+        return self.info.get('last_build') or datetime.now(timezone.utc)
+
+    def _write_rss(self, f: TextIO, items: Iterable[Dict[str, Any]]) -> int:
+        """RSS 2.0"""
+        info = self.info
+        f.write("<?xml version='1.0' encoding='UTF-8'?>\n")
+        f.write('<rss xmlns:dc="http://purl.org/dc/elements/1.1/" version="2.0">\n')
+        f.write('  <channel>\n')
+        f.write(f"    <title>{_clean(info['title'])}</title>\n")
+        f.write(f"    <link>{_clean(info['link'])}</link>\n")
+        f.write(f"    <description>{_clean(info['description'])}</description>\n")
+        if info.get('category'):
+            f.write(f"    <category>{_clean(info['category'])}</category>\n")
+        f.write(f"    <language>{_clean(info.get('language', 'zh-CN'))}</language>\n")
+        f.write(f"    <lastBuildDate>{format_datetime(self._last_build())}</lastBuildDate>\n")
+        f.write(f"    <ttl>{int(info.get('ttl', 180))}</ttl>\n")
+
+        count = 0
+        for item in items:
+            entry = self._entry(item)
+            f.write('    <item>\n')
+            f.write(f"      <title>{_clean(entry['title'])}</title>\n")
+            f.write(f"      <link>{_clean(entry['link'])}</link>\n")
+            f.write(f"      <description>{_clean(entry['description'])}</description>\n")
+            if entry['id']:
+                f.write(f"      <guid isPermaLink=\"false\">{_clean(entry['id'])}</guid>\n")
+            if entry['published']:
+                f.write(f"      <pubDate>{format_datetime(entry['published'])}</pubDate>\n")
+            f.write(f"      <dc:creator>{_clean(entry['source'])}</dc:creator>\n")
+            f.write('    </item>\n')
+            count += 1
+
+        f.write('  </channel>\n</rss>\n')
+        return count
+
+    def _write_atom(self, f: TextIO, items: Iterable[Dict[str, Any]]) -> int:
+        """Atom 1.0"""
+        info = self.info
+        f.write("<?xml version='1.0' encoding='UTF-8'?>\n")
+        f.write(f"<feed xmlns=\"http://www.w3.org/2005/Atom\" xml:lang={_attr(info.get('language', 'zh-CN'))}>\n")
+        f.write(f"  <id>{_clean(info['id'])}</id>\n")
+        f.write(f"  <title>{_clean(info['title'])}</title>\n")
+        f.write(f"  <subtitle>{_clean(info['description'])}</subtitle>\n")
+        f.write(f"  <updated>{self._last_build().isoformat()}</updated>\n")
+        f.write(f"  <link href={_attr(info['link'])} rel=\"alternate\"/>\n")
+        f.write(f"  <link href={_attr(info['feed_url'] + self.EXTENSIONS['atom'])} rel=\"self\"/>\n")
+        f.write(f"  <author><name>{_clean(info.get('author', 'Auto News Aggregator'))}</name></author>\n")
+        if info.get('category'):
+            f.write(f"  <category term={_attr(info['category'])}/>\n")
+
+        count = 0
+        for item in items:
+            entry = self._entry(item)
+            updated = entry['published'] or self._last_build()
+            f.write('  <entry>\n')
+            f.write(f"    <id>urn:news-aggregator:{_clean(entry['id'] or entry['link'])}</id>\n")
+            f.write(f"    <title>{_clean(entry['title'])}</title>\n")
+            f.write(f"    <link href={_attr(entry['link'])} rel=\"alternate\"/>\n")
+            f.write(f"    <summary>{_clean(entry['description'])}</summary>\n")
+            f.write(f"    <updated>{updated.isoformat()}</updated>\n")
+            f.write(f"    <author><name>{_clean(entry['source'])}</name></author>\n")
+            f.write('  </entry>\n')
+            count += 1
+
+        f.write('</feed>\n')
+        return count
+
+    def _write_json(self, f: TextIO, items: Iterable[Dict[str, Any]]) -> int:
+        """JSON Feed 1.1"""
+        info = self.info
+        header = {
+            'version': 'https://jsonfeed.org/version/1.1',
+            'title': info['title'],
+            'home_page_url': info['link'],
+            'feed_url': info['feed_url'] + self.EXTENSIONS['json'],
+            'description': info['description'],
+            'language': info.get('language', 'zh-CN'),
+            'authors': [{'name': info.get('author', 'Auto News Aggregator')}]
+        }
+        # 去掉结尾的 }，后面逐条追加 items
+        f.write(json.dumps(header, ensure_ascii=False)[:-1])
+        f.write(', "items": [')
+
+        count = 0
+        for item in items:
+            entry = self._entry(item)
+            record: Dict[str, Optional[Any]] = {
+                'id': entry['id'] or entry['link'],
+                'url': entry['link'],
+                'title': entry['title'],
+                'content_text': entry['description'],
+                'authors': [{'name': entry['source']}]
+            }
+            if entry['published']:
+                record['date_published'] = entry['published'].isoformat()
+
+            f.write(',\n' if count else '\n')
+            f.write(json.dumps(record, ensure_ascii=False))
+            count += 1
+
+        f.write('\n]}\n')
+        return count
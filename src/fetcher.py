@@ -1,14 +1,28 @@
 """新闻抓取器模块"""
 import asyncio
 import aiohttp
+import codecs
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+import re
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from datetime import datetime
 from pathlib import Path
 import json
 import time
 
+try:
+    import brotli  # noqa: F401  aiohttp 用于解码 br 响应
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
 from .config import Config
+from .http_cache import HTTPCache
+from .rate_limiter import HostRateLimiter
+from .source_health import SourceHealth
+from .poll_scheduler import PollScheduler
+from .utils import NewsUtils
 
 
 class NewsFetcher:
@@ -19,6 +33,27 @@ class NewsFetcher:
         self.fetcher_config = config.get_fetcher_config()
         self.logger = self._setup_logger()
         self.session = None
+        # 常驻进程中保持连接池跨多次运行复用
+        self.keep_session = self.fetcher_config.get('persistent_session', False)
+        # 错峰窗口（秒），未配置时为 0；常驻模式下未配置时使用 daemon.stagger_window
+        self.stagger_window = self.fetcher_config.get('stagger_window', 0)
+        self._connections_created = 0
+        self._connections_reused = 0
+        self.http_cache = self._create_http_cache()
+        self.not_modified_urls = set()
+        # 内容指纹与上次相同的URL（上次的解析结果仍然有效）
+        self.unchanged_urls = set()
+        self.last_run = None
+        self.rate_limiter = self._create_rate_limiter()
+        self.source_health = self._create_source_health()
+        self.poll_scheduler = self._create_poll_scheduler()
+        self.skipped_sources = []
+        self.not_due_sources = []
+        self.unchanged_sources = []
+        self.cut_off_sources = []
+        self._deadline = None
+        self._run_started_at = time.time()
+        self._reset_concurrency()
         
     def _setup_logger(self) -> logging.Logger:
         """设置日志"""
@@ -36,6 +71,114 @@ class NewsFetcher:
         
         return logger
     
+    def _reset_concurrency(self):
+        """重置并发限制器和并行度统计（信号量在事件循环内按需创建）"""
+        self._global_semaphore = None
+        self._host_semaphores = {}
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._busy_time = 0.0
+        self._hedged_requests = 0
+        self._hedge_wins = 0
+    
+    def _get_global_semaphore(self) -> asyncio.Semaphore:
+        """获取全局并发信号量"""
+        if self._global_semaphore is None:
+            self._global_semaphore = asyncio.Semaphore(self.fetcher_config.get('max_concurrency', 10))
+        return self._global_semaphore
+    
+    def _get_host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """获取单个主机的并发信号量"""
+        host = NewsUtils.extract_domain(url)
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.fetcher_config.get('max_per_host', 2))
+        return self._host_semaphores[host]
+    
+    def _create_rate_limiter(self) -> HostRateLimiter:
+        """创建按主机划分的令牌桶限速器"""
+        rate = self.fetcher_config.get('requests_per_second')
+        if rate is None:
+            # 兼容旧配置：请求间隔换算为每秒请求数
+            delay = self.fetcher_config.get('delay_between_requests', 2)
+            rate = 1 / delay if delay > 0 else 0
+        
+        return HostRateLimiter(rate, self.fetcher_config.get('burst', 1))
+    
+    def _create_http_cache(self) -> Optional[HTTPCache]:
+        """创建HTTP条件请求缓存"""
+        if not self.fetcher_config.get('http_cache', True):
+            return None
+        
+        data_dir = self.config.get_storage_config().get('data_dir', 'data')
+        return HTTPCache(str(Path(data_dir) / 'http_cache'))
+    
+    def _create_source_health(self) -> SourceHealth:
+        """创建按源的熔断器和自适应超时状态"""
+        data_dir = self.config.get_storage_config().get('data_dir', 'data')
+        return SourceHealth(
+            str(Path(data_dir) / 'source_health.json'),
+            circuit_config=self.fetcher_config.get('circuit_breaker', {}),
+            timeout_config=self.fetcher_config.get('adaptive_timeout', {})
+        )
+    
+    def _create_poll_scheduler(self) -> PollScheduler:
+        """创建按源的自适应轮询状态"""
+        data_dir = self.config.get_storage_config().get('data_dir', 'data')
+        return PollScheduler(
+            str(Path(data_dir) / 'poll_state.json'),
+            self.fetcher_config.get('adaptive_polling', {})
+        )
+    
+    def _is_poll_due(self, url: str) -> bool:
+        """源本次是否需要请求：未到轮询时间且有上次的解析结果可复用时不需要"""
+        if self.poll_scheduler.is_due(url):
+            return True
+        return not (self.http_cache and self.http_cache.has_items(url))
+    
+    @staticmethod
+    def _new_fingerprint(source: Optional[Dict[str, Any]] = None):
+        """内容指纹的哈希对象：先混入源配置，修改选择器等配置后指纹随之变化，不会复用旧的解析结果"""
+        digest = hashlib.blake2b(digest_size=16)
+        if source:
+            digest.update(json.dumps(source, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'))
+        return digest
+    
+    def _content_fingerprint(self, url: str, content: str) -> str:
+        """页面内容指纹：优先使用下载时计算并缓存的指纹"""
+        fingerprint = self.http_cache.get_fingerprint(url) if self.http_cache else None
+        if fingerprint:
+            return fingerprint
+        digest = self._new_fingerprint()
+        digest.update(content.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _create_connector(self) -> aiohttp.TCPConnector:
+        """创建连接池（DNS缓存、按主机限流、keep-alive）"""
+        connector_config = self.fetcher_config.get('connector', {})
+        
+        return aiohttp.TCPConnector(
+            limit=connector_config.get('limit', self.fetcher_config.get('max_concurrency', 10)),
+            limit_per_host=connector_config.get('limit_per_host', self.fetcher_config.get('max_per_host', 2)),
+            ttl_dns_cache=connector_config.get('ttl_dns_cache', 300),
+            use_dns_cache=True,
+            keepalive_timeout=connector_config.get('keepalive_timeout', 30),
+            enable_cleanup_closed=connector_config.get('enable_cleanup_closed', True)
+        )
+    
+    def _create_trace_config(self) -> aiohttp.TraceConfig:
+        """创建连接复用统计的跟踪配置"""
+        trace_config = aiohttp.TraceConfig()
+        
+        async def on_connection_create_end(session, context, params):
+            self._connections_created += 1
+        
+        async def on_connection_reuseconn(session, context, params):
+            self._connections_reused += 1
+        
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+    
     async def _create_session(self):
         """创建HTTP会话"""
         if self.session is None or self.session.closed:
@@ -43,7 +186,17 @@ class NewsFetcher:
             headers = {
                 'User-Agent': self.fetcher_config.get('user_agent', 'Mozilla/5.0')
             }
-            self.session = aiohttp.ClientSession(timeout=timeout, headers=headers)
+            
+            # 协商HTTP压缩，aiohttp 会自动解压
+            if self.fetcher_config.get('compression', True):
+                headers['Accept-Encoding'] = 'gzip, deflate, br' if HAS_BROTLI else 'gzip, deflate'
+            
+            self.session = aiohttp.ClientSession(
+                timeout=timeout,
+                headers=headers,
+                connector=self._create_connector(),
+                trace_configs=[self._create_trace_config()]
+            )
     
     async def close_session(self):
         """关闭HTTP会话"""
@@ -51,21 +204,196 @@ class NewsFetcher:
             await self.session.close()
             self.session = None
     
-    async def fetch_url(self, url: str, retry_count: int = 0) -> Optional[str]:
+    def _detect_charset(self, response: aiohttp.ClientResponse, body: bytes) -> str:
+        """检测响应编码：BOM > Content-Type 响应头 > meta 标签 > UTF-8"""
+        if body.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        
+        charset = response.charset
+        if not charset:
+            # 同时匹配 <meta charset="..."> 和 http-equiv 的 content="...; charset=..."
+            match = re.search(rb'<meta[^>]+charset=["\']?\s*([\w-]+)', body[:4096], re.IGNORECASE)
+            if match:
+                charset = match.group(1).decode('ascii')
+        
+        charset = (charset or 'utf-8').lower()
+        
+        # GB2312/GBK 网页中常混有超出字符集的字符，统一按超集 GB18030 解码
+        if charset in ('gb2312', 'gbk', 'x-gbk'):
+            charset = 'gb18030'
+        
+        try:
+            codecs.lookup(charset)
+        except LookupError:
+            charset = 'utf-8'
+        
+        return charset
+    
+    async def _read_body(self, response: aiohttp.ClientResponse, url: str,
+                         source: Optional[Dict[str, Any]] = None) -> Tuple[str, str]:
+        """分块读取响应正文，超过大小上限或遇到截止标记时提前结束
+
+        返回 (正文, 内容指纹)。指纹在读取过程中对原始字节增量计算（blake2b），
+        覆盖的正是保留下来的字节：配置了 stop_marker 时正文截止到标记末尾，
+        指纹只覆盖标记之前的新闻区域，页面底部变化的推荐、统计代码等不会影响指纹。
+        """
+        source = source or {}
+        max_bytes = source.get('max_bytes', self.fetcher_config.get('max_body_bytes', 5 * 1024 * 1024))
+        stop_marker = source.get('stop_marker')
+        stop_marker = stop_marker.encode('utf-8') if stop_marker else None
+        
+        chunks = []
+        size = 0
+        tail = b''
+        digest = self._new_fingerprint(source)
+        
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            if max_bytes and size + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - size]
+            
+            marker_found = False
+            if stop_marker:
+                # 拼接上一块的末尾，避免标记跨块时漏检
+                window = tail + chunk
+                index = window.find(stop_marker)
+                if index >= 0:
+                    # 只保留到标记末尾：保留的字节和指纹与网络分块边界无关
+                    chunk = chunk[:index + len(stop_marker) - len(tail)]
+                    marker_found = True
+                else:
+                    tail = window[-len(stop_marker):]
+            
+            chunks.append(chunk)
+            digest.update(chunk)
+            size += len(chunk)
+            
+            if marker_found:
+                self.logger.debug(f"已读取到截止标记，提前结束下载: {url}")
+                break
+            
+            if max_bytes and size >= max_bytes:
+                self.logger.warning(f"响应超过大小上限 {max_bytes} 字节，已截断: {url}")
+                break
+        
+        body = b''.join(chunks)
+        return body.decode(self._detect_charset(response, body), errors='replace'), digest.hexdigest()
+    
+    async def _request(self, url: str, headers: Dict[str, str], timeout: float,
+                       source: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """发送一次请求，成功时返回内容"""
+        # 全局并发只在网络请求期间占用
+        async with self._get_global_semaphore():
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            start_time = time.time()
+            
+            try:
+                async with self.session.get(url, headers=headers,
+                                            timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    if response.status == 304 and headers:
+                        content = self.http_cache.get_content(url)
+                        if content:
+                            self.source_health.record_success(url, time.time() - start_time)
+                            self.not_modified_urls.add(url)
+                            self.logger.info(f"URL未更新(304)，使用缓存内容: {url}")
+                            return content
+                    
+                    if response.status == 200:
+                        content, fingerprint = await self._read_body(response, url, source)
+                        if self.http_cache:
+                            unchanged = self.http_cache.store_response(
+                                url, content,
+                                response.headers.get('ETag'),
+                                response.headers.get('Last-Modified'),
+                                fingerprint
+                            )
+                            if unchanged:
+                                self.unchanged_urls.add(url)
+                                self.logger.info(f"URL内容指纹未变化，复用上次解析结果: {url}")
+                        self.source_health.record_success(url, time.time() - start_time)
+                        self.logger.info(f"成功获取URL: {url}")
+                        return content
+                    else:
+                        self.logger.warning(f"获取URL失败: {url} (状态码: {response.status})")
+                        return None
+            finally:
+                self._in_flight -= 1
+                self._busy_time += time.time() - start_time
+    
+    def _hedge_delay(self, url: str) -> Optional[float]:
+        """对冲请求的等待时间：该源耗时的指定百分位数，未启用或样本不足时返回 None"""
+        hedging_config = self.fetcher_config.get('hedging', {})
+        if not hedging_config.get('enabled', False) or self.source_health.is_probing(url):
+            return None
+        
+        delay = self.source_health.percentile(url, hedging_config.get('percentile', 95))
+        if delay is None:
+            return None
+        return max(delay, hedging_config.get('min_delay', 0.5))
+    
+    async def _hedged_request(self, url: str, headers: Dict[str, str], timeout: float, delay: float,
+                              source: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """对冲请求：首个请求超过 delay 秒未完成时再发一个相同的请求，先成功的为准"""
+        primary = asyncio.ensure_future(self._request(url, headers, timeout, source))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+            
+            self._hedged_requests += 1
+            self.logger.info(f"{url} 超过 {delay:.2f} 秒未完成，发出对冲请求")
+            
+            async def backup_request() -> Optional[str]:
+                await self.rate_limiter.acquire(url, source)
+                return await self._request(url, headers, timeout, source)
+            
+            backup = asyncio.ensure_future(backup_request())
+            pending.add(backup)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                    elif task.result() is not None:
+                        if task is backup:
+                            self._hedge_wins += 1
+                        return task.result()
+            if error is not None:
+                raise error
+            return None
+        finally:
+            # 另一个请求（或运行被取消时的全部请求）不再需要
+            for task in pending:
+                task.cancel()
+    
+    async def fetch_url(self, url: str, retry_count: int = 0,
+                        source: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """获取URL内容"""
-        max_retries = self.fetcher_config.get('retry_times', 3)
+        # 熔断冷却后的试探请求失败时不再重试
+        max_retries = 0 if self.source_health.is_probing(url) else self.fetcher_config.get('retry_times', 3)
+        # 单次请求超时按该源最近的 p95 耗时自适应
+        timeout = self.source_health.timeout_for(url, self.fetcher_config.get('timeout', 30))
         
         try:
             await self._create_session()
             
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    content = await response.text('utf-8')
-                    self.logger.info(f"成功获取URL: {url}")
-                    return content
-                else:
-                    self.logger.warning(f"获取URL失败: {url} (状态码: {response.status})")
+            headers = self.http_cache.get_conditional_headers(url) if self.http_cache else {}
+            
+            # 按主机令牌桶限速，不同主机的请求互不等待
+            await self.rate_limiter.acquire(url, source)
+            
+            hedge_delay = self._hedge_delay(url)
+            if hedge_delay is not None:
+                content = await self._hedged_request(url, headers, timeout, hedge_delay, source)
+            else:
+                content = await self._request(url, headers, timeout, source)
+            if content is not None:
+                return content
                     
+        except asyncio.TimeoutError:
+            self.logger.error(f"获取URL超时: {url} ({timeout:.1f}秒)")
         except Exception as e:
             self.logger.error(f"获取URL异常: {url} - {e}")
         
@@ -74,8 +402,9 @@ class NewsFetcher:
             delay = 2 ** retry_count  # 指数退避
             self.logger.info(f"{url} 重试 {retry_count + 1}/{max_retries}，等待 {delay}秒...")
             await asyncio.sleep(delay)
-            return await self.fetch_url(url, retry_count + 1)
+            return await self.fetch_url(url, retry_count + 1, source)
         
+        self.source_health.record_failure(url)
         return None
     
     async def fetch_source(self, source: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -87,23 +416,51 @@ class NewsFetcher:
             self.logger.warning(f"新闻源 '{name}' 没有配置URL")
             return None
         
-        self.logger.info(f"开始抓取: {name} ({url})")
-        
-        content = await self.fetch_url(url)
-        if not content:
-            self.logger.error(f"抓取失败: {name}")
+        # 熔断打开的源在冷却期内直接跳过
+        if not self.source_health.allow(url):
+            self.logger.warning(f"新闻源 '{name}' 熔断中，跳过抓取")
+            self.skipped_sources.append(name)
             return None
         
-        # 延迟请求，避免过于频繁
-        delay = self.fetcher_config.get('delay_between_requests', 2)
-        await asyncio.sleep(delay)
+        # 未到轮询时间的源不发请求，解析阶段复用上次的解析结果
+        if not self._is_poll_due(url):
+            self.logger.info(f"新闻源 '{name}' 未到轮询时间，复用上次结果")
+            self.not_due_sources.append(name)
+            return {
+                'name': name,
+                'url': url,
+                'content': None,
+                'fetched_at': datetime.now().isoformat(),
+                'category': source.get('category', 'unknown'),
+                'not_modified': True
+            }
+        
+        # 单主机并发限制
+        async with self._get_host_semaphore(url):
+            self.logger.info(f"开始抓取: {name} ({url})")
+            
+            content = await self.fetch_url(url, source=source)
+            if not content:
+                self.logger.error(f"抓取失败: {name}")
+                return None
+        
+        # 304 或内容指纹未变化时，解析阶段直接复用上次的解析结果
+        not_modified = url in self.not_modified_urls or url in self.unchanged_urls
+        if url in self.unchanged_urls:
+            self.unchanged_sources.append(name)
+        self.not_modified_urls.discard(url)
+        self.unchanged_urls.discard(url)
+        
+        if self.poll_scheduler.enabled:
+            self.poll_scheduler.record(url, self._content_fingerprint(url, content))
         
         return {
             'name': name,
             'url': url,
             'content': content,
             'fetched_at': datetime.now().isoformat(),
-            'category': source.get('category', 'unknown')
+            'category': source.get('category', 'unknown'),
+            'not_modified': not_modified
         }
     
     async def fetch_category(self, category: str) -> List[Dict[str, Any]]:
@@ -120,9 +477,13 @@ class NewsFetcher:
         for source in sources:
             source['category'] = category
         
-        # 并发抓取
-        tasks = [self.fetch_source(source) for source in sources]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # 并发抓取（到达运行截止时间时未完成的源被取消）
+        async def staggered_fetch(source: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            await self._stagger(source)
+            return await self.fetch_source(source)
+        
+        tasks = [asyncio.ensure_future(staggered_fetch(source)) for source in sources]
+        results = await self._gather_until_deadline(tasks, sources)
         
         # 过滤失败的结果
         successful_results = []
@@ -136,54 +497,229 @@ class NewsFetcher:
         
         return successful_results
     
+    def _stagger_offset(self, source: Dict[str, Any]) -> float:
+        """源在错峰窗口内的固定偏移（按源名称哈希，每次运行相同）"""
+        window = self.stagger_window
+        if not window:
+            return 0.0
+        digest = hashlib.sha1(source.get('name', source.get('url', '')).encode('utf-8')).digest()
+        return int.from_bytes(digest[:4], 'big') / 2 ** 32 * window
+    
+    async def _stagger(self, source: Dict[str, Any]):
+        """错峰：各源在 stagger_window 秒内按固定偏移依次开始，避免同时请求所有源"""
+        if not self._is_poll_due(source.get('url', '')):
+            return
+        offset = self._stagger_offset(source) - (time.time() - self._run_started_at)
+        if offset > 0:
+            await asyncio.sleep(offset)
+    
+    def _remaining_time(self) -> Optional[float]:
+        """距运行截止时间的秒数，未设置截止时间时返回 None"""
+        if self._deadline is None:
+            return None
+        return max(self._deadline - time.time(), 0)
+    
+    def _cut_off(self, jobs: List[Dict[str, Any]], tasks: List[asyncio.Future]):
+        """取消截止时间到达时仍未完成的抓取，并记录被截断的源"""
+        cut_off = []
+        for source, task in zip(jobs, tasks):
+            if not task.done():
+                task.cancel()
+                cut_off.append(source.get('name', 'Unknown'))
+        if cut_off:
+            self.cut_off_sources.extend(cut_off)
+            self.logger.warning(f"已到达运行截止时间，取消未完成的源: {cut_off}")
+    
+    async def _gather_until_deadline(self, tasks: List[asyncio.Future],
+                                     sources: List[Dict[str, Any]]) -> List[Any]:
+        """等待抓取任务完成；到达运行截止时间时取消未完成的任务，其结果记为 None"""
+        timeout = self._remaining_time()
+        if timeout is None:
+            return await asyncio.gather(*tasks, return_exceptions=True)
+        
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        if pending:
+            self._cut_off(sources, tasks)
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        return [
+            (task.exception() or task.result()) if task in done else None
+            for task in tasks
+        ]
+    
     async def fetch_all_categories(self) -> Dict[str, List[Dict[str, Any]]]:
-        """抓取所有分类的新闻"""
+        """抓取所有分类的新闻（所有分类的源同时调度，由并发信号量限流）"""
         categories = self.config.get_categories()
-        results = {}
         
-        for category in categories:
-            results[category] = await self.fetch_category(category)
+        category_results = await asyncio.gather(
+            *(self.fetch_category(category) for category in categories)
+        )
+        
+        return dict(zip(categories, category_results))
+    
+    def _begin_run(self):
+        """开始一次抓取运行：重置并发统计并记录起始状态"""
+        self._reset_concurrency()
+        self.skipped_sources = []
+        self.not_due_sources = []
+        self.unchanged_sources = []
+        self.cut_off_sources = []
+        self._run_started_at = time.time()
+        # 运行截止时间：到达后取消未完成的抓取，用已到达的结果继续
+        deadline = self.fetcher_config.get('deadline', 0)
+        self._deadline = self._run_started_at + deadline if deadline else None
+        self._run_connections = (self._connections_created, self._connections_reused)
+    
+    def _build_run_result(self, category_results: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """汇总一次抓取运行的结果和统计信息"""
+        total_sources = sum(
+            len(self.config.get_enabled_sources(category)) for category in category_results
+        )
+        successful_sources = sum(
+            len(sources) for sources in category_results.values()
+        )
+        not_modified_sources = sum(
+            1 for sources in category_results.values()
+            for source in sources if source.get('not_modified')
+        ) - len(self.not_due_sources)
+        
+        elapsed_time = time.time() - self._run_started_at
+        # 平均并行度 = 各源抓取耗时之和 / 总耗时
+        avg_parallelism = self._busy_time / elapsed_time if elapsed_time > 0 else 0
+        # 本次运行的连接复用情况
+        created = self._connections_created - self._run_connections[0]
+        reused = self._connections_reused - self._run_connections[1]
+        
+        self.logger.info(f"抓取任务完成，耗时 {elapsed_time:.2f} 秒")
+        
+        # 各源的熔断状态和耗时分布
+        default_timeout = self.fetcher_config.get('timeout', 30)
+        configured_sources = [
+            source
+            for category in category_results
+            for source in self.config.get_enabled_sources(category) if source.get('url')
+        ]
+        source_health = {
+            source.get('name', source['url']): self.source_health.report(source['url'], default_timeout)
+            for source in configured_sources
+        }
+        poll_schedule = {
+            source.get('name', source['url']): self.poll_scheduler.report(source['url'])
+            for source in configured_sources
+        } if self.poll_scheduler.enabled else {}
         
-        return results
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'categories': category_results,
+            'stats': {
+                'total_categories': len(category_results),
+                'total_sources': total_sources,
+                'successful_sources': successful_sources,
+                'not_modified_sources': not_modified_sources,
+                'peak_parallelism': self._peak_in_flight,
+                'avg_parallelism': round(avg_parallelism, 2),
+                'connections_created': created,
+                'connections_reused': reused,
+                'connection_reuse_rate': round(reused / (created + reused), 2) if created + reused else 0,
+                'skipped_sources': list(self.skipped_sources),
+                'not_due_sources': list(self.not_due_sources),
+                'unchanged_sources': list(self.unchanged_sources),
+                'deadline_reached': bool(self.cut_off_sources),
+                'cut_off_sources': list(self.cut_off_sources),
+                'hedged_requests': self._hedged_requests,
+                'hedge_wins': self._hedge_wins,
+                'source_health': source_health,
+                'poll_schedule': poll_schedule,
+                'elapsed_time': round(elapsed_time, 2)
+            }
+        }
     
     async def fetch_all(self) -> Dict[str, Any]:
         """执行完整的抓取流程"""
         self.logger.info("开始执行新闻抓取任务")
         
-        start_time = time.time()
+        self._begin_run()
         
         try:
             # 抓取所有分类
             category_results = await self.fetch_all_categories()
-            
-            # 统计信息
-            total_sources = sum(len(sources) for sources in category_results.values())
-            successful_sources = sum(
-                len(sources) for sources in category_results.values()
-            )
-            
-            elapsed_time = time.time() - start_time
-            
-            result = {
-                'timestamp': datetime.now().isoformat(),
-                'categories': category_results,
-                'stats': {
-                    'total_categories': len(category_results),
-                    'total_sources': total_sources,
-                    'successful_sources': successful_sources,
-                    'elapsed_time': round(elapsed_time, 2)
-                }
-            }
-            
-            self.logger.info(f"抓取任务完成，耗时 {elapsed_time:.2f} 秒")
-            
-            return result
+            return self._build_run_result(category_results)
             
         except Exception as e:
             self.logger.error(f"抓取任务异常: {e}")
             raise
         finally:
-            await self.close_session()
+            self.source_health.save()
+            self.poll_scheduler.save()
+            if not self.keep_session:
+                await self.close_session()
+    
+    async def iter_fetch(self) -> AsyncIterator[Dict[str, Any]]:
+        """流水线抓取：所有源同时调度，每抓完一个源立即产出结果
+        
+        已抓取但尚未被消费的页面最多 max_concurrency 个，消费方取走下一个结果时
+        才释放上一个名额，因此内存占用与并发度成正比，而与源的数量无关。
+        产出的结果不再保留在抓取器中，运行结束后 last_run 中只有不含正文的摘要。
+        """
+        self.logger.info("开始执行流水线抓取任务")
+        
+        self._begin_run()
+        buffer = asyncio.Semaphore(self.fetcher_config.get('max_concurrency', 10))
+        queue = asyncio.Queue()
+        
+        async def produce(category: str, source: Dict[str, Any]):
+            # 先错峰等待再占用缓冲名额，等待中的源不占并发
+            await self._stagger(source)
+            await buffer.acquire()
+            source['category'] = category
+            try:
+                result = await self.fetch_source(source)
+            except Exception as e:
+                self.logger.error(f"抓取异常: {e}")
+                result = None
+            await queue.put(result)
+        
+        jobs = [
+            (category, source)
+            for category in self.config.get_categories()
+            for source in self.config.get_enabled_sources(category)
+        ]
+        tasks = [asyncio.ensure_future(produce(category, source)) for category, source in jobs]
+        summaries = {category: [] for category in self.config.get_categories()}
+        
+        def summarize(result: Dict[str, Any]):
+            summaries[result['category']].append(
+                {key: value for key, value in result.items() if key != 'content'}
+            )
+        
+        try:
+            for _ in range(len(tasks)):
+                try:
+                    result = await asyncio.wait_for(queue.get(), self._remaining_time())
+                except asyncio.TimeoutError:
+                    # 到达截止时间：取消未完成的源，已到达但尚未取走的结果照常产出
+                    self._cut_off([source for _, source in jobs], tasks)
+                    while not queue.empty():
+                        result = queue.get_nowait()
+                        if result is not None:
+                            summarize(result)
+                            yield result
+                    break
+                
+                if result is not None:
+                    summarize(result)
+                    yield result
+                buffer.release()
+            
+            self.last_run = self._build_run_result(summaries)
+        finally:
+            # 消费方提前结束时取消尚未完成的抓取
+            for task in tasks:
+                task.cancel()
+            self.source_health.save()
+            self.poll_scheduler.save()
+            if not self.keep_session:
+                await self.close_session()
     
     def save_results(self, results: Dict[str, Any], output_dir: str = "data"):
         """保存抓取结果到文件"""
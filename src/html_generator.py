@@ -1,18 +1,73 @@
 """HTML页面生成器模块"""
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Callable, Iterable, Tuple
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-import logging
+import hashlib
 import json
+import logging
+import math
+import re
+import threading
+
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, select_autoescape
+from markupsafe import Markup
+
+from .utils import NewsUtils
+
+# 默认模板目录（项目根目录下的 templates）
+DEFAULT_TEMPLATE_DIR = Path(__file__).parent.parent / 'templates'
 
 
 class HTMLGenerator:
-    """HTML生成器类"""
+    """HTML生成器类
+    
+    页面由 Jinja2 模板渲染，模板环境在进程内只创建一次、模板只编译一次；
+    可选把编译结果缓存到磁盘（html.bytecode_cache）。主题样式表写成一个
+    按内容哈希命名的 .css 文件，所有页面共同引用。
+    
+    分类页面按 html.max_items_per_page 分页，历史新闻按日期归档到 archive/YYYY/MM/DD.html。
+    每个页面按其内容（新闻ID、分页信息）和模板版本计算指纹，与上次写入时相同则跳过渲染，
+    站点历史变长后每次运行也只重新生成内容有变化的页面。
+    """
+    
+    CATEGORY_NAMES = {'tech': '科技', 'finance': '财经', 'entertainment': '娱乐', 'all': '全部'}
+    NAV_CATEGORIES = ['tech', 'finance', 'entertainment']
     
     def __init__(self, config: Any):
         self.config = config
         self.html_config = config.get_html_config()
         self.logger = self._setup_logger()
+        
+        template_dir = self.html_config.get('template_dir') or str(DEFAULT_TEMPLATE_DIR)
+        bytecode_cache_dir = None
+        if self.html_config.get('bytecode_cache', False):
+            bytecode_cache_dir = str(Path(config.get_output_dirs()['data']) / 'jinja_cache')
+        self.env = _get_environment(template_dir, bytecode_cache_dir)
+        
+        # 输出目录 -> 样式表相对路径（多个渲染线程共享）
+        self._stylesheets: Dict[str, str] = {}
+        self._stylesheet_lock = threading.Lock()
+        
+        # 新闻项HTML片段缓存：同一条新闻出现在首页和分类页时只渲染一次
+        self._item_macro = self.env.get_template('_macros.html').module.news_item
+        self._fragments: Dict[int, Any] = {}
+        
+        self.per_page = max(int(self.html_config.get('max_items_per_page', 20)), 1)
+        
+        # 各页面上次写入时的指纹（页面路径 -> 指纹）
+        self.incremental = self.html_config.get('incremental', True)
+        self.state_file = Path(config.get_output_dirs()['data']) / 'html_state.json'
+        self.page_state: Dict[str, str] = {}
+        if self.incremental and self.state_file.exists():
+            self.page_state = NewsUtils.load_json_file(str(self.state_file))
+        
+        # 模板、样式或页面配置变化时，所有页面都需要重新生成
+        self.render_version = self._compute_render_version()
+        self.version_changed = self.page_state.get('_version') != self.render_version
+        
+        # 本次运行报告：重写了哪些页面，哪些未变化
+        self.run_report: Dict[str, List[str]] = {'rewritten': [], 'unchanged': []}
     
     def _setup_logger(self) -> logging.Logger:
         """设置日志"""
@@ -145,6 +200,18 @@ class HTMLGenerator:
                     font-size: 12px; 
                     color: #aaa;
                 }
+                .pager { text-align: center; margin: 15px 0; }
+                .pager a, .pager .current { 
+                    display: inline-block; 
+                    padding: 5px 10px; 
+                    margin: 0 2px; 
+                    border-radius: 5px; 
+                    color: #4a9eff; 
+                    background: #3d3d3d; 
+                    text-decoration: none;
+                }
+                .pager .current { background: #4a9eff; color: #fff; }
+                .archive-list a { color: #4a9eff; text-decoration: none; }
             """
         elif theme == 'minimal':
             return """
@@ -190,6 +257,10 @@ class HTMLGenerator:
                     border-top: 1px solid #eee; 
                     padding-top: 20px;
                 }
+                .pager { text-align: center; margin: 20px 0; font-size: 14px; }
+                .pager a, .pager .current { margin: 0 6px; color: #333; }
+                .pager .current { font-weight: bold; }
+                .archive-list a { color: #333; }
             """
         else:  # modern (default)
             return """
@@ -387,395 +458,411 @@ class HTMLGenerator:
                     margin-top: 10px;
                     text-align: center;
                 }
+                .pager { text-align: center; margin: 20px 0; }
+                .pager a, .pager .current { 
+                    display: inline-block; 
+                    padding: 6px 12px; 
+                    margin: 0 3px; 
+                    border-radius: 20px; 
+                    background: #f8f9fa; 
+                    color: #667eea; 
+                    text-decoration: none; 
+                    font-size: 14px;
+                }
+                .pager .current { background: #667eea; color: white; }
+                .archive-list { line-height: 2; }
+                .archive-list a { color: #2c3e50; text-decoration: none; font-weight: 600; }
             """
     
-    def _format_time(self, iso_time: str) -> str:
-        """格式化时间"""
-        try:
-            dt = datetime.fromisoformat(iso_time.replace('Z', '+00:00'))
-            return dt.strftime('%Y-%m-%d %H:%M')
-        except:
-            return iso_time
+    def _compute_render_version(self) -> str:
+        """模板源码、主题样式和页面配置的哈希"""
+        digest = hashlib.sha1(self._get_css_styles().encode('utf-8'))
+        digest.update(json.dumps(self.html_config, sort_keys=True, default=str).encode('utf-8'))
+        digest.update(self.config.config.get('github_repo', '').encode('utf-8'))
+        for name in sorted(self.env.list_templates(extensions=['html'])):
+            source, _, _ = self.env.loader.get_source(self.env, name)
+            digest.update(name.encode('utf-8'))
+            digest.update(source.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _page_fingerprint(self, *parts: Any) -> str:
+        """页面指纹：模板版本 + 决定页面内容的各部分"""
+        digest = hashlib.sha1(self.render_version.encode('utf-8'))
+        for part in parts:
+            digest.update(b'\0')
+            digest.update(json.dumps(part, ensure_ascii=False, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+    
+    # 模板中渲染的新闻项字段：其中任何一个变化（如标题修正、新增"另见"链接）都要重写页面
+    RENDERED_FIELDS = ('id', 'title', 'link', 'description', 'source', 'published_at', 'alternates')
+    
+    @classmethod
+    def _item_fields(cls, items: Iterable[Dict[str, Any]]) -> List[List[Any]]:
+        """页面指纹中的新闻项部分"""
+        return [
+            [item.get(field) for field in cls.RENDERED_FIELDS] + [NewsUtils.item_timestamp(item)]
+            for item in items
+        ]
+    
+    def _publish(self, filepath: Path, fingerprint: str, render: Callable[[], str], output_dir: str) -> str:
+        """页面内容有变化时渲染并写入，否则跳过"""
+        # 样式表先于页面确定，跳过的页面引用的样式表也必须存在
+        self._stylesheet(output_dir)
+        
+        key = filepath.as_posix()
+        if self.incremental and self.page_state.get(key) == fingerprint and filepath.exists():
+            self.run_report['unchanged'].append(key)
+            return str(filepath)
+        
+        self._write_page(filepath, render())
+        self.page_state[key] = fingerprint
+        self.run_report['rewritten'].append(key)
+        return str(filepath)
+    
+    def save_state(self):
+        """保存页面指纹，供下次运行比较"""
+        if self.incremental and (self.run_report['rewritten'] or self.version_changed):
+            self.page_state['_version'] = self.render_version
+            NewsUtils.save_json_file(self.page_state, str(self.state_file), indent=None)
+    
+    def _forget_page(self, filepath: Path):
+        """删除页面文件及其指纹"""
+        filepath.unlink(missing_ok=True)
+        self.page_state.pop(filepath.as_posix(), None)
+    
+    def _stylesheet(self, output_dir: str) -> str:
+        """主题样式表相对于输出目录的路径
+        
+        样式表按内容哈希命名，每次运行只写一次（文件已存在即内容相同，无需重写），
+        所有页面共享，浏览器可长期缓存。
+        """
+        with self._stylesheet_lock:
+            if output_dir not in self._stylesheets:
+                css = self._get_css_styles()
+                digest = hashlib.sha1(css.encode('utf-8')).hexdigest()[:10]
+                relpath = f"assets/style.{digest}.css"
+                
+                filepath = Path(output_dir) / relpath
+                if not filepath.exists():
+                    with NewsUtils.atomic_write(str(filepath)) as f:
+                        f.write(css)
+                    # 清理旧版本的样式表
+                    for stale in filepath.parent.glob('style.*.css'):
+                        if stale != filepath:
+                            stale.unlink(missing_ok=True)
+                    self.logger.info(f"样式表已生成: {filepath}")
+                
+                self._stylesheets[output_dir] = relpath
+            return self._stylesheets[output_dir]
+    
+    @staticmethod
+    def _format_time(item: Dict[str, Any]) -> str:
+        """格式化时间（使用解析阶段预先计算的时间戳）"""
+        published_ts = NewsUtils.item_timestamp(item)
+        if published_ts is None:
+            return item.get('published_at') or ''
+        return datetime.fromtimestamp(published_ts).strftime('%Y-%m-%d %H:%M')
+    
+    def _render_items(self, items: List[Dict[str, Any]]) -> Markup:
+        """渲染新闻列表的HTML
+        
+        单条新闻的片段与所在页面无关，按对象缓存，首页和分类页中的同一条新闻只渲染一次。
+        """
+        fragments = []
+        for item in items:
+            cached = self._fragments.get(id(item))
+            if cached is None or cached[0] is not item:
+                cached = (item, self._item_macro(item))
+                self._fragments[id(item)] = cached
+            fragments.append(cached[1])
+        return Markup('\n'.join(fragments))
+    
+    def _render(self, template_name: str, output_dir: str, root: str, **context) -> str:
+        """渲染模板
+        
+        root 为页面所在目录到输出目录根的相对路径（首页为空，子目录页面为 ../）。
+        """
+        template = self.env.get_template(template_name)
+        return template.render(
+            root=root,
+            stylesheet=self._stylesheet(output_dir),
+            github_repo=self.config.config.get('github_repo', 'your-username/news-aggregator'),
+            year=datetime.now().year,
+            **context
+        )
+    
+    def page_count(self, items: List[Dict[str, Any]]) -> int:
+        """分类页面的页数"""
+        return max(1, math.ceil(len(items) / self.per_page))
+    
+    @staticmethod
+    def _category_page_name(category: str, page: int) -> str:
+        """分类页面文件名：第1页为 {分类}.html，之后为 {分类}-{页码}.html"""
+        return f"{category.lower()}.html" if page == 1 else f"{category.lower()}-{page}.html"
     
     def generate_main_page(self, categorized_items: Dict[str, List[Dict[str, Any]]], 
                           rss_files: Dict[str, str], output_dir: str = "docs") -> str:
-        """生成主页面"""
-        # 收集所有新闻
-        all_items = []
-        for items in categorized_items.values():
-            all_items.extend(items)
-        
-        # 按时间排序
-        all_items.sort(key=lambda x: x.get('published_at', ''), reverse=True)
-        
+        """生成主页面（各分类列表需已按发布时间倒序排列）"""
         # 统计信息
         stats = {
-            'total': len(all_items),
+            'total': sum(len(items) for items in categorized_items.values()),
             'tech': len(categorized_items.get('tech', [])),
             'finance': len(categorized_items.get('finance', [])),
             'entertainment': len(categorized_items.get('entertainment', [])),
-            'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
+        rss_categories = [category for category in rss_files if category != 'all']
+        
+        # 每个分类显示第一页的新闻，其余在分类页面中翻页查看
+        sections = [
+            (category, len(items), items[:self.per_page])
+            for category, items in categorized_items.items() if items
+        ]
+        
+        def render() -> str:
+            return self._render(
+                'index.html', output_dir, '',
+                title="新闻聚合器 - 首页",
+                current='index',
+                stats=dict(stats, updated_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+                rss_categories=rss_categories,
+                sections=[
+                    (category, count, self._render_items(items), count > len(items))
+                    for category, count, items in sections
+                ]
+            )
         
-        # 生成HTML
-        html = self._generate_html(
-            title="新闻聚合器 - 首页",
-            stats=stats,
-            categorized_items=categorized_items,
-            rss_files=rss_files,
-            is_main=True
+        fingerprint = self._page_fingerprint(
+            stats, rss_categories,
+            [(category, count, self._item_fields(items)) for category, count, items in sections]
         )
-        
-        # 保存文件
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
-        
-        filepath = output_path / "index.html"
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html)
+        filepath = self._publish(Path(output_dir) / "index.html", fingerprint, render, output_dir)
         
         self.logger.info(f"主页面已生成: {filepath}")
-        return str(filepath)
+        return filepath
     
     def generate_category_pages(self, categorized_items: Dict[str, List[Dict[str, Any]]], 
                                rss_files: Dict[str, str], output_dir: str = "docs") -> Dict[str, str]:
-        """生成分类页面"""
+        """生成分类页面（各分类列表需已按发布时间倒序排列），返回各分类第一页的路径"""
         output_files = {}
         
-        for category, items in categorized_items.items():
-            if not items:
+        for category, sorted_items in categorized_items.items():
+            if not sorted_items:
                 continue
-            
-            # 按时间排序
-            sorted_items = sorted(items, key=lambda x: x.get('published_at', ''), reverse=True)
-            
-            # 统计信息
-            stats = {
-                'total': len(sorted_items),
-                'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
-            
-            # 生成HTML
-            html = self._generate_html(
-                title=f"新闻聚合器 - {category.upper()} 分类",
-                stats=stats,
-                categorized_items={category: sorted_items},
-                rss_files=rss_files,
-                category=category,
-                is_main=False
-            )
-            
-            # 保存文件
-            output_path = Path(output_dir) / "category"
-            output_path.mkdir(parents=True, exist_ok=True)
-            
-            filepath = output_path / f"{category.lower()}.html"
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(html)
-            
-            output_files[category] = str(filepath)
-            self.logger.info(f"分类页面已生成: {filepath}")
+            for page in range(1, self.page_count(sorted_items) + 1):
+                filepath = self.generate_category_page(category, sorted_items, rss_files, output_dir, page)
+                if page == 1:
+                    output_files[category] = filepath
         
         return output_files
     
-    def _generate_html(self, title: str, stats: Dict[str, Any], 
-                      categorized_items: Dict[str, List[Dict[str, Any]]],
-                      rss_files: Dict[str, str], category: str = None, 
-                      is_main: bool = False) -> str:
-        """生成HTML内容"""
-        css_styles = self._get_css_styles()
-        
-        # 生成导航
-        nav_html = self._generate_nav(is_main, category)
-        
-        # 生成统计信息
-        stats_html = self._generate_stats(stats)
-        
-        # 生成新闻内容
-        content_html = self._generate_content(categorized_items, is_main)
-        
-        # 生成RSS链接
-        rss_html = self._generate_rss_links(rss_files, category)
-        
-        # 生成时间戳
-        timestamp_html = f'<div class="timestamp">最后更新: {stats.get("updated_at", "未知")}</div>'
-        
-        # 完整的HTML
-        html = f"""<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <style>{css_styles}</style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>📰 新闻聚合器</h1>
-            <p>自动聚合科技、财经、娱乐新闻 | 每日更新</p>
-        </div>
-        
-        {nav_html}
-        
-        {stats_html}
-        
-        {rss_html}
-        
-        {content_html}
-        
-        {timestamp_html}
-        
-        <div class="footer">
-            <p>Powered by Auto News Aggregator | 
-            <a href="https://github.com/your-username/news-aggregator" target="_blank">GitHub</a> | 
-            <a href="https://github.com/your-username/news-aggregator/actions" target="_blank">Actions</a></p>
-            <p>© {datetime.now().year} 新闻聚合器 | 本页面由GitHub Actions自动生成</p>
-        </div>
-    </div>
-</body>
-</html>"""
-        
-        return html
-    
-    def _generate_nav(self, is_main: bool, current_category: str = None) -> str:
-        """生成导航栏"""
-        categories = ['tech', 'finance', 'entertainment']
-        category_names = {'tech': '科技', 'finance': '财经', 'entertainment': '娱乐'}
-        
-        nav_items = []
-        
-        # 首页链接
-        if is_main:
-            nav_items.append('<a href="../index.html" class="active">🏠 首页</a>')
-        else:
-            nav_items.append('<a href="../index.html">🏠 首页</a>')
-        
-        # 分类链接
-        for cat in categories:
-            if cat == current_category:
-                nav_items.append(f'<a href="{cat}.html" class="active">📊 {category_names[cat]}</a>')
-            else:
-                nav_items.append(f'<a href="{cat}.html">📊 {category_names[cat]}</a>')
-        
-        # RSS链接
-        nav_items.append('<a href="../rss" target="_blank">📡 RSS订阅</a>')
-        
-        return f'<div class="nav">{" ".join(nav_items)}</div>'
-    
-    def _generate_stats(self, stats: Dict[str, Any]) -> str:
-        """生成统计信息"""
-        if not stats:
-            return ""
+    def generate_category_page(self, category: str, sorted_items: List[Dict[str, Any]],
+                               rss_files: Dict[str, str], output_dir: str = "docs", page: int = 1) -> str:
+        """生成分类的某一页（各页面互不依赖，可并发生成）"""
+        pages = self.page_count(sorted_items)
+        page_items = sorted_items[(page - 1) * self.per_page:page * self.per_page]
+        rss_categories = [name for name in rss_files if name != 'all']
+        
+        if page == 1:
+            self._remove_stale_pages(category, pages, output_dir)
+        
+        pagination = {
+            'page': page,
+            'pages': pages,
+            'links': [(number, self._category_page_name(category, number)) for number in range(1, pages + 1)]
+        }
         
-        stats_items = []
-        
-        if 'total' in stats:
-            stats_items.append(f"""
-                <div class="stat-item">
-                    <span class="stat-value">{stats['total']}</span>
-                    <span class="stat-label">总新闻数</span>
-                </div>
-            """)
-        
-        if 'tech' in stats and stats['tech'] > 0:
-            stats_items.append(f"""
-                <div class="stat-item">
-                    <span class="stat-value">{stats['tech']}</span>
-                    <span class="stat-label">科技</span>
-                </div>
-            """)
-        
-        if 'finance' in stats and stats['finance'] > 0:
-            stats_items.append(f"""
-                <div class="stat-item">
-                    <span class="stat-value">{stats['finance']}</span>
-                    <span class="stat-label">财经</span>
-                </div>
-            """)
-        
-        if 'entertainment' in stats and stats['entertainment'] > 0:
-            stats_items.append(f"""
-                <div class="stat-item">
-                    <span class="stat-value">{stats['entertainment']}</span>
-                    <span class="stat-label">娱乐</span>
-                </div>
-            """)
-        
-        if not stats_items:
-            return ""
+        def render() -> str:
+            return self._render(
+                'category.html', output_dir, '../',
+                title=f"新闻聚合器 - {category.upper()} 分类" + (f" - 第{page}页" if page > 1 else ""),
+                current=category,
+                stats={
+                    'total': len(sorted_items),
+                    'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                },
+                rss_categories=rss_categories,
+                category=category,
+                items_html=self._render_items(page_items),
+                pagination=pagination
+            )
+        
+        fingerprint = self._page_fingerprint(
+            len(sorted_items), rss_categories, pagination, self._item_fields(page_items)
+        )
+        filepath = Path(output_dir) / "category" / self._category_page_name(category, page)
+        filepath = self._publish(filepath, fingerprint, render, output_dir)
         
-        return f'<div class="stats">{" ".join(stats_items)}</div>'
+        self.logger.info(f"分类页面已生成: {filepath}")
+        return filepath
+    
+    def _remove_stale_pages(self, category: str, pages: int, output_dir: str):
+        """删除超出当前页数的旧分页"""
+        pattern = re.compile(rf"{re.escape(category.lower())}-(\d+)\.html$")
+        for path in (Path(output_dir) / "category").glob(f"{category.lower()}-*.html"):
+            match = pattern.match(path.name)
+            if match and int(match.group(1)) > pages:
+                self._forget_page(path)
+    
+    def _archive_page_path(self, day: str, output_dir: str) -> Path:
+        """归档页面路径：archive/YYYY/MM/DD.html"""
+        year, month, date = day.split('-')
+        return Path(output_dir) / "archive" / year / month / f"{date}.html"
     
-    def _generate_content(self, categorized_items: Dict[str, List[Dict[str, Any]]], is_main: bool) -> str:
-        """生成新闻内容"""
-        content_parts = []
+    def archive_days_to_render(self, archive: Any, output_dir: str = "docs") -> List[str]:
+        """需要生成的归档日期
+        
+        只有本次新增了新闻的日期、页面文件缺失的日期需要重新生成；
+        模板版本变化时全部重新生成。未变化的日期不读取其归档文件。
+        """
+        return [
+            day for day in archive.days()
+            if self.version_changed
+            or not self.incremental
+            or day in archive.changed_days
+            or not self._archive_page_path(day, output_dir).exists()
+        ]
+    
+    def generate_archive_day(self, day: str, categorized_items: Dict[str, List[Dict[str, Any]]],
+                             output_dir: str = "docs") -> str:
+        """生成某一天的归档页面"""
+        sections = [(category, items) for category, items in categorized_items.items() if items]
+        
+        def render() -> str:
+            return self._render(
+                'archive_day.html', output_dir, '../../../',
+                title=f"新闻归档 - {day}",
+                current='archive',
+                day=day,
+                total=sum(len(items) for _, items in sections),
+                sections=[
+                    (category, len(items), self._render_items(items), False)
+                    for category, items in sections
+                ]
+            )
         
-        for category, items in categorized_items.items():
-            if not items:
-                continue
-            
-            category_names = {'tech': '科技', 'finance': '财经', 'entertainment': '娱乐'}
-            category_name = category_names.get(category, category)
-            
-            # 分类标题
-            if is_main:
-                content_parts.append(f"""
-                    <div class="category-section">
-                        <h2 class="category-title">
-                            {category_name}新闻
-                            <span style="font-size: 14px; color: #6c757d; font-weight: normal;">
-                                ({len(items)}条)
-                            </span>
-                        </h2>
-                """)
-            else:
-                content_parts.append(f"""
-                    <div class="category-section">
-                        <h2 class="category-title">
-                            {category_name}新闻
-                        </h2>
-                """)
-            
-            # 新闻列表
-            for item in items[:20]:  # 每个分类最多显示20条
-                title = item.get('title', '无标题')
-                link = item.get('link', '#')
-                description = item.get('description', '')
-                source = item.get('source', '未知来源')
-                published_at = item.get('published_at', '')
-                
-                # 截断描述
-                if description and len(description) > 150:
-                    description = description[:150] + "..."
-                
-                content_parts.append(f"""
-                    <div class="news-item">
-                        <div class="news-title">
-                            <a href="{link}" target="_blank">{title}</a>
-                        </div>
-                        <div class="news-meta">
-                            <span class="news-source">{source}</span>
-                            <span class="news-time">{self._format_time(published_at) if published_at else ''}</span>
-                        </div>
-                        <div class="news-description">{description}</div>
-                    </div>
-                """)
-            
-            content_parts.append('</div>')
-        
-        if not content_parts:
-            return '<div class="category-section"><p style="text-align: center; color: #6c757d;">暂无新闻数据</p></div>'
-        
-        return ''.join(content_parts)
-    
-    def _generate_rss_links(self, rss_files: Dict[str, str], current_category: str = None) -> str:
-        """生成RSS链接"""
-        if not rss_files:
-            return ""
+        fingerprint = self._page_fingerprint(
+            day, [(category, self._item_fields(items)) for category, items in sections]
+        )
+        filepath = self._publish(self._archive_page_path(day, output_dir), fingerprint, render, output_dir)
         
-        rss_items = []
+        self.logger.info(f"归档页面已生成: {filepath}")
+        return filepath
+    
+    def generate_archive_index(self, day_counts: List[Tuple[str, int]], output_dir: str = "docs") -> str:
+        """生成归档目录页面（按月分组列出所有日期）"""
+        months: Dict[str, List[Tuple[str, str, int]]] = {}
+        for day, count in day_counts:
+            year, month, date = day.split('-')
+            months.setdefault(f"{year}-{month}", []).append((day, f"{year}/{month}/{date}.html", count))
+        
+        def render() -> str:
+            return self._render(
+                'archive_index.html', output_dir, '../',
+                title="新闻归档 - 新闻聚合器",
+                current='archive',
+                months=list(months.items())
+            )
         
-        for category, filepath in rss_files.items():
-            if category == 'all':
-                continue
-            
-            category_names = {'tech': '科技', 'finance': '财经', 'entertainment': '娱乐'}
-            category_name = category_names.get(category, category)
-            
-            # 相对路径
-            rel_path = f"../rss/{category}.xml"
-            
-            rss_items.append(f"""
-                <a href="{rel_path}" target="_blank" title="订阅{category_name}RSS">
-                    📡 {category_name}RSS
-                </a>
-            """)
-        
-        if not rss_items:
-            return ""
+        fingerprint = self._page_fingerprint(day_counts)
+        filepath = self._publish(Path(output_dir) / "archive" / "index.html", fingerprint, render, output_dir)
         
-        return f'<div class="nav">{" ".join(rss_items)}</div>'
+        self.logger.info(f"归档目录页面已生成: {filepath}")
+        return filepath
+    
+    def remove_archive_pages(self, days: Iterable[str], output_dir: str = "docs"):
+        """删除已淘汰日期的归档页面"""
+        for day in days:
+            self._forget_page(self._archive_page_path(day, output_dir))
+    
+    def _write_page(self, filepath: Path, html: str):
+        """写入页面文件（原子替换，服务器不会读到写了一半的页面）"""
+        with NewsUtils.atomic_write(str(filepath)) as f:
+            f.write(html)
     
     def generate_feeds_page(self, rss_files: Dict[str, str], output_dir: str = "docs") -> str:
         """生成RSS订阅页面"""
         if not rss_files:
             return ""
         
-        category_names = {'tech': '科技', 'finance': '财经', 'entertainment': '娱乐', 'all': '全部'}
-        
-        feeds_html = ""
-        for category, filepath in rss_files.items():
-            rel_path = f"../rss/{category}.xml"
-            feeds_html += f"""
-                <div class="news-item">
-                    <div class="news-title">
-                        <a href="{rel_path}" target="_blank">
-                            📡 {category_names.get(category, category)} RSS 订阅源
-                        </a>
-                    </div>
-                    <div class="news-description">
-                        订阅 {category_names.get(category, category)} 分类的新闻。
-                        使用 RSS 阅读器（如 Feedly、Inoreader）添加此链接即可自动接收更新。
-                    </div>
-                </div>
-            """
+        feeds = list(rss_files)
+        if 'all' not in feeds:
+            feeds.append('all')
         
-        html = f"""<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>RSS订阅 - 新闻聚合器</title>
-    <style>{self._get_css_styles()}</style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>📡 RSS订阅</h1>
-            <p>使用 RSS 阅读器订阅新闻更新</p>
-        </div>
-        
-        <div class="nav">
-            <a href="../index.html">🏠 首页</a>
-            <a href="tech.html">📊 科技</a>
-            <a href="finance.html">📊 财经</a>
-            <a href="entertainment.html">📊 娱乐</a>
-        </div>
-        
-        <div class="category-section">
-            <h2 class="category-title">订阅源列表</h2>
-            {feeds_html}
-        </div>
-        
-        <div class="category-section">
-            <h2 class="category-title">如何使用 RSS</h2>
-            <div class="news-item">
-                <div class="news-description">
-                    <strong>步骤：</strong><br>
-                    1. 选择一个 RSS 阅读器（如 Feedly、Inoreader、NewsBlur）<br>
-                    2. 点击上方的订阅链接<br>
-                    3. 将链接粘贴到阅读器中<br>
-                    4. 即可自动接收新闻更新
-                </div>
-            </div>
-        </div>
-        
-        <div class="footer">
-            <p>Powered by Auto News Aggregator | 
-            <a href="https://github.com/your-username/news-aggregator" target="_blank">GitHub</a></p>
-        </div>
-    </div>
-</body>
-</html>"""
-        
-        # 保存文件
-        output_path = Path(output_dir) / "rss"
-        output_path.mkdir(parents=True, exist_ok=True)
-        
-        filepath = output_path / "index.html"
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html)
+        def render() -> str:
+            return self._render(
+                'feeds.html', output_dir, '../',
+                title="RSS订阅 - 新闻聚合器",
+                current='feeds',
+                feeds=feeds
+            )
+        
+        filepath = Path(output_dir) / "rss" / "index.html"
+        filepath = self._publish(filepath, self._page_fingerprint(feeds), render, output_dir)
         
         self.logger.info(f"RSS订阅页面已生成: {filepath}")
-        return str(filepath)
\ No newline at end of file
+        return filepath
+
+
+def _shorten(text: Any, length: int) -> str:
+    """截断描述"""
+    text = text or ''
+    return text[:length] + "..." if len(text) > length else text
+
+
+# 模板目录 -> 创建模板环境时的模板文件签名（常驻进程用来检测模板修改）
+_template_signatures: Dict[str, Any] = {}
+
+
+def _template_signature(template_dir: str) -> Any:
+    """模板目录下各文件的修改时间和大小"""
+    return sorted(
+        (str(path), path.stat().st_mtime_ns, path.stat().st_size)
+        for path in Path(template_dir).rglob('*') if path.is_file()
+    )
+
+
+def refresh_templates() -> bool:
+    """模板文件有修改时丢弃已编译的模板环境，下次生成页面时重新编译，返回是否丢弃
+
+    模板环境按进程缓存且不自动检查模板修改（auto_reload=False），常驻进程在每次运行前调用。
+    """
+    changed = [
+        template_dir for template_dir, signature in _template_signatures.items()
+        if _template_signature(template_dir) != signature
+    ]
+    if not changed:
+        return False
+    
+    _get_environment.cache_clear()
+    _template_signatures.clear()
+    logging.getLogger(__name__).info(f"模板文件已修改，重新编译模板: {changed}")
+    return True
+
+
+@lru_cache(maxsize=None)
+def _get_environment(template_dir: str, bytecode_cache_dir: Optional[str] = None) -> Environment:
+    """获取模板环境（进程内按参数复用，模板只编译一次）"""
+    _template_signatures[template_dir] = _template_signature(template_dir)
+    bytecode_cache = None
+    if bytecode_cache_dir:
+        Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+    
+    env = Environment(
+        loader=FileSystemLoader(template_dir),
+        autoescape=select_autoescape(['html']),
+        bytecode_cache=bytecode_cache,
+        auto_reload=False,
+        trim_blocks=True,
+        lstrip_blocks=True
+    )
+    env.filters['format_time'] = HTMLGenerator._format_time
+    env.filters['shorten'] = _shorten
+    env.globals['category_names'] = HTMLGenerator.CATEGORY_NAMES
+    env.globals['nav_categories'] = HTMLGenerator.NAV_CATEGORIES
+    
+    # 预先编译全部模板，渲染线程不再触发编译
+    for name in env.list_templates(extensions=['html']):
+        env.get_template(name)
+    
+    return env
@@ -0,0 +1,130 @@
+"""HTTP条件请求缓存模块"""
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .utils import NewsUtils
+from .models import NewsItem
+
+
+class HTTPCache:
+    """HTTP验证器缓存类
+
+    按URL持久化 ETag / Last-Modified 和响应正文，用于发送条件请求；
+    同时保存该源上次的解析结果，服务器返回 304 或本次未到轮询时间时可直接复用。
+    服务器不支持条件请求时只保存解析结果，不保存正文。
+    每次下载时还会计算正文的内容指纹；指纹与上次相同时保留解析结果，同样直接复用。
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.logger = logging.getLogger(__name__)
+        # 内存中只保留验证器和指纹；正文和解析结果较大，需要时再从磁盘读取，
+        # 内存占用不随源的数量和常驻进程的运行时间增长
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+
+    def _entry_path(self, url: str) -> Path:
+        """缓存条目文件路径"""
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def _load_entry(self, url: str) -> Dict[str, Any]:
+        """从磁盘读取完整的缓存条目"""
+        path = self._entry_path(url)
+        return NewsUtils.load_json_file(str(path)) if path.exists() else {}
+
+    @staticmethod
+    def _summarize(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """缓存条目的摘要：验证器、指纹以及是否保存了正文和解析结果"""
+        return {
+            'etag': entry.get('etag'),
+            'last_modified': entry.get('last_modified'),
+            'fingerprint': entry.get('fingerprint'),
+            'has_content': bool(entry.get('content')),
+            'has_items': entry.get('items') is not None
+        } if entry else {}
+
+    def _get_summary(self, url: str) -> Dict[str, Any]:
+        """读取缓存条目摘要（进程内只读一次磁盘）"""
+        if url not in self._summaries:
+            self._summaries[url] = self._summarize(self._load_entry(url))
+        return self._summaries[url]
+
+    def _save_entry(self, url: str, entry: Dict[str, Any]):
+        """保存缓存条目"""
+        self._summaries[url] = self._summarize(entry)
+        NewsUtils.save_json_file(entry, str(self._entry_path(url)), indent=None)
+
+    def get_conditional_headers(self, url: str) -> Dict[str, str]:
+        """获取条件请求头"""
+        summary = self._get_summary(url)
+        # 没有缓存正文时，304 无法复用，不发送条件请求
+        if not summary.get('has_content'):
+            return {}
+
+        headers = {}
+        if summary.get('etag'):
+            headers['If-None-Match'] = summary['etag']
+        if summary.get('last_modified'):
+            headers['If-Modified-Since'] = summary['last_modified']
+        return headers
+
+    def get_content(self, url: str) -> Optional[str]:
+        """获取缓存的响应正文（服务器返回 304 时从磁盘读取）"""
+        if not self._get_summary(url).get('has_content'):
+            return None
+        return self._load_entry(url).get('content')
+
+    def store_response(self, url: str, content: str, etag: Optional[str], last_modified: Optional[str],
+                       fingerprint: Optional[str] = None) -> bool:
+        """保存响应正文及验证器，返回内容指纹是否与上次相同（相同时上次的解析结果仍然有效）"""
+        previous = self._get_summary(url)
+        unchanged = bool(fingerprint) and fingerprint == previous.get('fingerprint') \
+            and previous.get('has_items')
+
+        # 服务器不支持条件请求时不保存正文（不会发送条件请求），只为解析结果保留条目
+        has_validators = bool(etag or last_modified)
+        entry = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'content': content if has_validators else None,
+            'fingerprint': fingerprint,
+            'items': None  # 正文已变化，旧的解析结果失效
+        }
+
+        if unchanged:
+            # 内容和验证器都没有变化时不必重写缓存文件
+            if self._summarize(dict(entry, items=[])) == previous:
+                return True
+            entry['items'] = self._load_entry(url).get('items')
+
+        self._save_entry(url, entry)
+        return unchanged
+
+    def get_fingerprint(self, url: str) -> Optional[str]:
+        """获取上次下载的内容指纹"""
+        return self._get_summary(url).get('fingerprint')
+
+    def has_items(self, url: str) -> bool:
+        """是否保存了上次的解析结果"""
+        return bool(self._get_summary(url).get('has_items'))
+
+    def get_items(self, url: str) -> Optional[List[NewsItem]]:
+        """获取上次的解析结果"""
+        if not self.has_items(url):
+            return None
+        items = self._load_entry(url).get('items')
+        if items is None:
+            return None
+        return [NewsItem.from_dict(item) for item in items]
+
+    def store_items(self, url: str, items: List[NewsItem]):
+        """保存解析结果（仅对已缓存的URL生效）"""
+        if not self._get_summary(url):
+            return
+
+        entry = self._load_entry(url)
+        entry['items'] = [item.to_dict() for item in items]
+        self._save_entry(url, entry)
@@ -4,16 +4,22 @@ import logging
 from pathlib import Path
 import sys
 import os
+from typing import Optional
 
-# 添加src目录到Python路径
-src_path = Path(__file__).parent
-sys.path.insert(0, str(src_path))
+# 添加项目根目录到Python路径（src 内的模块使用包内相对导入）
+root_path = Path(__file__).parent.parent
+sys.path.insert(0, str(root_path))
 
-from config import Config
-from fetcher import NewsFetcher
-from parser import NewsParser
-from rss_generator import RSSGenerator
-from html_generator import HTMLGenerator
+from src.config import Config
+from src.fetcher import NewsFetcher
+from src.parser import NewsParser
+from src.rss_generator import RSSGenerator
+from src.html_generator import HTMLGenerator
+from src.renderer import RenderStage
+from src.seen_store import SeenStore
+from src.near_dedup import NearDuplicateDetector
+from src.archive import NewsArchive
+from src.compressor import OutputCompressor
 
 
 def setup_logging(config: Config):
@@ -37,6 +43,16 @@ def setup_logging(config: Config):
     )
 
 
+def create_parser(config: Config, fetcher: NewsFetcher) -> NewsParser:
+    """按配置创建解析器（与抓取器共享HTTP缓存）"""
+    parser_config = config.get_parser_config()
+    return NewsParser(
+        cache=fetcher.http_cache,
+        engine=parser_config.get('engine', 'html.parser'),
+        restrict_tree=parser_config.get('restrict_tree', False)
+    )
+
+
 async def run_news_aggregator(config_path: str = "config.yaml"):
     """运行新闻聚合器"""
     try:
@@ -51,34 +67,86 @@ async def run_news_aggregator(config_path: str = "config.yaml"):
         
         # 设置日志
         setup_logging(config)
-        logger = logging.getLogger(__name__)
-        
-        logger.info("新闻聚合器启动")
+        logging.getLogger(__name__).info("新闻聚合器启动")
         
         # 创建输出目录
         config.create_directories()
         
-        # 步骤1: 抓取新闻
-        print("正在抓取新闻...")
-        logger.info("开始抓取新闻")
+        return await run_pipeline(config)
+        
+    except Exception as e:
+        print(f"运行失败: {e}")
+        logging.error(f"运行失败: {e}", exc_info=True)
+        return False
+
+
+async def run_pipeline(config: Config, fetcher: Optional[NewsFetcher] = None,
+                       parser: Optional[NewsParser] = None) -> bool:
+    """执行一次完整的抓取、解析、生成流程
+    
+    常驻进程传入长期保持的抓取器和解析器（连接池、HTTP缓存、源健康状态和解析进程池
+    跨运行复用）；未传入时为本次运行创建，结束后关闭。
+    """
+    logger = logging.getLogger(__name__)
+    owns_parser = parser is None
+    fetcher = fetcher or NewsFetcher(config)
+    parser = parser or create_parser(config, fetcher)
+    
+    try:
+        # 步骤1-2: 流水线抓取和解析新闻（每抓完一个源立即解析）
+        print("正在抓取并解析新闻...")
+        logger.info("开始抓取并解析新闻")
+        
+        try:
+            categorized_items = await parser.parse_stream(fetcher.iter_fetch(), config)
+        finally:
+            if owns_parser:
+                parser.close()
         
-        fetcher = NewsFetcher(config)
-        results = await fetcher.run(save=True)
+        results = fetcher.last_run
+        fetcher.save_results(results, config.get_output_dirs()['data'])
         
         print(f"抓取完成: {results['stats']['successful_sources']}/{results['stats']['total_sources']} 个源成功")
         logger.info(f"抓取完成: {results['stats']['successful_sources']}/{results['stats']['total_sources']} 个源成功")
+        if results['stats']['skipped_sources']:
+            print(f"熔断跳过: {', '.join(results['stats']['skipped_sources'])}")
+        if results['stats']['not_due_sources']:
+            print(f"未到轮询时间（复用上次结果）: {len(results['stats']['not_due_sources'])} 个源")
+        if results['stats']['unchanged_sources']:
+            print(f"内容未变化（复用上次结果）: {len(results['stats']['unchanged_sources'])} 个源")
+        if results['stats']['cut_off_sources']:
+            print(f"超过截止时间被取消: {', '.join(results['stats']['cut_off_sources'])}")
         
-        # 步骤2: 解析新闻
-        print("正在解析新闻...")
-        logger.info("开始解析新闻")
+        # 跨分类、跨运行去重（已见新闻持久化在 data_dir）
+        storage_config = config.get_storage_config()
+        if storage_config.get('deduplicate', True):
+            seen_store = SeenStore(str(Path(config.get_output_dirs()['data']) / 'seen_items.db'))
+            try:
+                seen_store.evict(storage_config.get('keep_days', 30))
+                categorized_items = seen_store.deduplicate(
+                    categorized_items,
+                    skip_known=storage_config.get('skip_known', False)
+                )
+            finally:
+                seen_store.close()
         
-        parser = NewsParser()
-        categorized_items = parser.parse_category_data(results['categories'], config)
+        # 近似重复检测（同一事件的不同来源合并为一条）
+        near_dup_config = storage_config.get('near_duplicates', {})
+        near_dup_detector = None
+        if near_dup_config.get('enabled', True):
+            near_dup_detector = NearDuplicateDetector(
+                threshold=near_dup_config.get('threshold', 0.6),
+                num_perm=near_dup_config.get('num_perm', 32),
+                bands=near_dup_config.get('bands', 8),
+                min_shingles=near_dup_config.get('min_shingles', 10)
+            )
         
         # 去重和过滤
         for category in categorized_items:
             items = categorized_items[category]
             items = parser.deduplicate_items(items)
+            if near_dup_detector:
+                items = near_dup_detector.collapse(items)
             items = parser.filter_by_time(items, hours=24)  # 只保留24小时内的新闻
             items = parser.sort_items(items)
             categorized_items[category] = items
@@ -86,52 +154,45 @@ async def run_news_aggregator(config_path: str = "config.yaml"):
         print(f"解析完成: {sum(len(items) for items in categorized_items.values())} 条新闻")
         logger.info(f"解析完成: {sum(len(items) for items in categorized_items.values())} 条新闻")
         
-        # 步骤3: 生成RSS
-        print("正在生成RSS订阅源...")
-        logger.info("开始生成RSS订阅源")
+        # 步骤3-4: 并发生成RSS订阅源和HTML页面
+        print("正在生成RSS订阅源和HTML页面...")
+        logger.info("开始生成RSS订阅源和HTML页面")
         
         rss_generator = RSSGenerator(config)
+        html_generator = HTMLGenerator(config)
         output_dirs = config.get_output_dirs()
         
-        rss_files = rss_generator.generate_all_rss(categorized_items, output_dirs['rss'])
-        
-        # 生成总RSS
-        all_items = []
-        for items in categorized_items.values():
-            all_items.extend(items)
-        all_items = parser.sort_items(all_items)
-        
-        if all_items:
-            rss_generator.generate_index_rss(all_items, output_dirs['rss'])
+        # 按日期归档本次的新闻（归档页面只重新生成新增了新闻的日期）
+        archive = None
+        archive_config = config.get_html_config().get('archive', {})
+        if archive_config.get('enabled', True):
+            archive = NewsArchive(str(Path(output_dirs['data']) / 'archive'))
+            archive.evict(archive_config.get('keep_days', 0))
+            archive.add(categorized_items)
+            archive.save()
         
-        print(f"RSS生成完成: {len(rss_files)} 个文件")
-        logger.info(f"RSS生成完成: {len(rss_files)} 个文件")
+        rendered = await RenderStage(config, rss_generator, html_generator).run(categorized_items, archive)
+        rss_files = rendered['rss_files']
         
-        # 步骤4: 生成HTML页面
-        print("正在生成HTML页面...")
-        logger.info("开始生成HTML页面")
-        
-        html_generator = HTMLGenerator(config)
-        
-        # 生成主页面
-        main_page = html_generator.generate_main_page(
-            categorized_items, 
-            rss_files, 
-            output_dirs['html']
+        rss_report = rss_generator.run_report
+        print(f"RSS生成完成: {len(rss_files)} 个文件，重写 {len(rss_report['rewritten'])} 个")
+        logger.info(
+            f"RSS生成完成: {len(rss_files)} 个文件，重写: {rss_report['rewritten']}，"
+            f"未变化: {rss_report['unchanged']}"
         )
         
-        # 生成分类页面
-        category_pages = html_generator.generate_category_pages(
-            categorized_items, 
-            rss_files, 
-            output_dirs['html']
+        html_report = html_generator.run_report
+        html_pages = len(html_report['rewritten']) + len(html_report['unchanged'])
+        print(f"HTML生成完成: {html_pages} 个页面，重写 {len(html_report['rewritten'])} 个")
+        logger.info(
+            f"HTML生成完成: {html_pages} 个页面，重写 {len(html_report['rewritten'])} 个，"
+            f"未变化 {len(html_report['unchanged'])} 个"
         )
         
-        # 生成RSS订阅页面
-        feeds_page = html_generator.generate_feeds_page(rss_files, output_dirs['html'])
-        
-        print(f"HTML生成完成: {len(category_pages) + 2} 个页面")
-        logger.info(f"HTML生成完成: {len(category_pages) + 2} 个页面")
+        # 为生成的文件写入 .gz / .br 预压缩副本（只压缩内容有变化的文件）
+        compress_report = await OutputCompressor(config).run([output_dirs['html'], output_dirs['rss']])
+        if compress_report['compressed']:
+            print(f"预压缩完成: {len(compress_report['compressed'])} 个文件")
         
         # 步骤5: 生成统计信息
         stats = {
@@ -139,7 +200,19 @@ async def run_news_aggregator(config_path: str = "config.yaml"):
             'categories': {},
             'total_items': 0,
             'rss_files': len(rss_files),
-            'html_pages': len(category_pages) + 2
+            'rss_rewritten': rss_report['rewritten'],
+            'rss_unchanged': rss_report['unchanged'],
+            'html_pages': html_pages,
+            'html_rewritten': len(html_report['rewritten']),
+            'html_unchanged': len(html_report['unchanged']),
+            'compressed_files': len(compress_report['compressed']),
+            'skipped_sources': results['stats']['skipped_sources'],
+            'cut_off_sources': results['stats']['cut_off_sources'],
+            'not_due_sources': results['stats']['not_due_sources'],
+            'unchanged_sources': results['stats']['unchanged_sources'],
+            'poll_schedule': results['stats']['poll_schedule'],
+            'hedged_requests': results['stats']['hedged_requests'],
+            'source_health': results['stats']['source_health']
         }
         
         for category, items in categorized_items.items():
@@ -178,13 +251,15 @@ async def run_news_aggregator(config_path: str = "config.yaml"):
 
 
 async def main():
-    """主函数"""
-    if len(sys.argv) > 1:
-        config_path = sys.argv[1]
-    else:
-        config_path = "config.yaml"
+    """主函数（--daemon 以常驻进程方式按 schedule 定时运行）"""
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    config_path = args[0] if args else "config.yaml"
     
-    success = await run_news_aggregator(config_path)
+    if '--daemon' in sys.argv[1:]:
+        from src.daemon import NewsDaemon
+        success = await NewsDaemon(config_path).serve(run_immediately='--now' in sys.argv[1:])
+    else:
+        success = await run_news_aggregator(config_path)
     
     if success:
         sys.exit(0)
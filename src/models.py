@@ -0,0 +1,118 @@
+"""数据模型模块"""
+import sys
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+
+from .utils import NewsUtils
+
+
+class NewsItem:
+    """新闻项
+
+    使用 __slots__ 的紧凑记录，代替每条新闻一个八键字典：来源和分类字符串经过驻留
+    在所有新闻间共享，发布/抓取时间只保存数值时间戳，published_at / fetched_at
+    在访问时才格式化。提供 get / [] / in 等字典式访问，原有按字典读写新闻项的代码无需修改。
+    """
+
+    __slots__ = (
+        'id', 'title', 'link', 'description', 'source', 'category',
+        'published_ts', 'fetched_ts', 'alternates'
+    )
+
+    # 可按字典方式访问的键（含由时间戳派生的两个时间字符串）
+    KEYS = frozenset(__slots__) | {'published_at', 'fetched_at'}
+
+    def __init__(self, id: str, title: str, link: str, description: str, source: str, category: str,
+                 published_ts: Optional[float] = None, fetched_ts: Optional[float] = None,
+                 alternates: Optional[List[Dict[str, str]]] = None):
+        self.id = id
+        self.title = title
+        self.link = link
+        self.description = description
+        self.source = sys.intern(source)
+        self.category = sys.intern(category)
+        self.published_ts = published_ts
+        self.fetched_ts = fetched_ts
+        self.alternates = alternates
+
+    @staticmethod
+    def _format_ts(timestamp: Optional[float]) -> Optional[str]:
+        """时间戳转ISO时间字符串"""
+        return datetime.fromtimestamp(timestamp).isoformat() if timestamp is not None else None
+
+    @property
+    def published_at(self) -> Optional[str]:
+        return self._format_ts(self.published_ts)
+
+    @published_at.setter
+    def published_at(self, value: Optional[str]):
+        self.published_ts = NewsUtils.parse_timestamp(value)
+
+    @property
+    def fetched_at(self) -> Optional[str]:
+        return self._format_ts(self.fetched_ts)
+
+    @fetched_at.setter
+    def fetched_at(self, value: Optional[str]):
+        self.fetched_ts = NewsUtils.parse_timestamp(value)
+
+    # 字典兼容接口：值为 None 的键视为不存在
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.KEYS and getattr(self, key) is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self.KEYS:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def keys(self) -> List[str]:
+        return [key for key in self.__slots__ if getattr(self, key) is not None]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可JSON序列化的字典"""
+        data = {key: getattr(self, key) for key in self.keys()}
+        data['published_at'] = self.published_at
+        data['fetched_at'] = self.fetched_at
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'NewsItem':
+        """从字典（包括旧格式的新闻项字典）创建"""
+        published_ts = data.get('published_ts')
+        if published_ts is None:
+            published_ts = NewsUtils.parse_timestamp(data.get('published_at'))
+
+        fetched_ts = data.get('fetched_ts')
+        if fetched_ts is None:
+            fetched_ts = NewsUtils.parse_timestamp(data.get('fetched_at'))
+
+        return cls(
+            id=data.get('id', ''),
+            title=data.get('title', ''),
+            link=data.get('link', ''),
+            description=data.get('description', ''),
+            source=data.get('source', 'Unknown'),
+            category=data.get('category', 'unknown'),
+            published_ts=published_ts,
+            fetched_ts=fetched_ts,
+            alternates=data.get('alternates')
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, NewsItem):
+            return NotImplemented
+        return all(getattr(self, key) == getattr(other, key) for key in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"NewsItem(id={self.id!r}, title={self.title!r}, source={self.source!r})"
@@ -0,0 +1,143 @@
+"""近似重复新闻聚类模块"""
+import logging
+import random
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Any, List, Set, Tuple
+
+
+class NearDuplicateDetector:
+    """基于 MinHash + LSH 的近似重复检测
+
+    对标题和描述做字符 n-gram 分片，计算 MinHash 签名，再按 LSH 分桶，
+    只有落入同一个桶的新闻才作为候选对比较，整体接近线性时间。
+    候选对的签名相似度（Jaccard 估计值）不低于阈值时归为同一簇。
+    分片数少于 min_shingles 的短文本无法可靠估计相似度（只差一个词的短标题 Jaccard 也很高），
+    不参与合并。
+    """
+
+    # 桶内成员不超过该数量时两两比较
+    MAX_BUCKET_PAIRS = 64
+
+    # 哈希排列 (a * h + b) % p 所用的梅森素数，远大于 32 位的分片哈希
+    PRIME = (1 << 61) - 1
+
+    def __init__(self, threshold: float = 0.6, num_perm: int = 32, bands: int = 8,
+                 shingle_size: int = 3, seed: int = 1, min_shingles: int = 10):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) 必须是 bands ({bands}) 的整数倍")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.min_shingles = min_shingles
+        self.logger = logging.getLogger(__name__)
+
+        # num_perm 个全域哈希 (a * h + b) % p 作为近似的最小独立排列族；
+        # 异或随机掩码得到的各签名位高度相关，会高估相似度。种子固定，结果跨运行稳定
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randrange(1, self.PRIME), rng.randrange(0, self.PRIME)) for _ in range(num_perm)
+        ]
+
+    def _shingles(self, text: str) -> Set[int]:
+        """文本的字符 n-gram 分片哈希集合"""
+        # 去掉空白和标点，中英文统一按字符切片
+        text = re.sub(r'[\W_]+', '', text.lower())
+        if len(text) <= self.shingle_size:
+            return {zlib.crc32(text.encode('utf-8'))} if text else set()
+
+        size = self.shingle_size
+        return {
+            zlib.crc32(text[i:i + size].encode('utf-8'))
+            for i in range(len(text) - size + 1)
+        }
+
+    def _item_text(self, item: Dict[str, Any]) -> str:
+        """用于比较的文本：标题 + 描述（描述与标题相同时只用标题）"""
+        title = item.get('title') or ''
+        description = item.get('description') or ''
+        if not description or description == title:
+            return title
+        return f"{title} {description}"
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """计算 MinHash 签名（分片过少时返回空签名，不参与合并）"""
+        hashes = self._shingles(text)
+        if len(hashes) < self.min_shingles:
+            return ()
+        prime = self.PRIME
+        return tuple(min((a * h + b) % prime for h in hashes) for a, b in self._permutations)
+
+    def _similarity(self, sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        """签名一致的比例，即 Jaccard 相似度的估计值"""
+        return sum(a == b for a, b in zip(sig_a, sig_b)) / self.num_perm
+
+    def cluster(self, items: List[Dict[str, Any]]) -> List[List[int]]:
+        """聚类，返回按首个成员排序的簇（新闻下标列表）"""
+        signatures = [self.signature(self._item_text(item)) for item in items]
+
+        # 并查集
+        parent = list(range(len(items)))
+
+        def find(index: int) -> int:
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        # LSH 分桶：任一 band 完全相同即为候选
+        buckets = defaultdict(list)
+        for index, sig in enumerate(signatures):
+            if not sig:
+                continue
+            for band in range(self.bands):
+                start = band * self.rows
+                buckets[(band, sig[start:start + self.rows])].append(index)
+
+        compared = set()
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+
+            # 小桶两两比较；异常大的桶（如大量相同短标题）只与桶内第一条比较，避免退化为平方复杂度
+            if len(members) <= self.MAX_BUCKET_PAIRS:
+                pairs = ((a, b) for i, a in enumerate(members) for b in members[i + 1:])
+            else:
+                pairs = ((members[0], b) for b in members[1:])
+
+            for a, b in pairs:
+                root_a, root_b = find(a), find(b)
+                if root_a == root_b or (a, b) in compared:
+                    continue
+                compared.add((a, b))
+                if self._similarity(signatures[a], signatures[b]) >= self.threshold:
+                    # 以下标较小者为根，簇代表即最先出现的新闻
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+
+        clusters = defaultdict(list)
+        for index in range(len(items)):
+            clusters[find(index)].append(index)
+
+        return sorted(clusters.values(), key=lambda members: members[0])
+
+    def collapse(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """把每个簇合并为一条新闻，其余来源记录在 alternates 中"""
+        if len(items) < 2:
+            return items
+
+        results = []
+        for members in self.cluster(items):
+            representative = items[members[0]]
+            if len(members) > 1:
+                representative['alternates'] = [
+                    {'source': items[index].get('source'), 'link': items[index].get('link')}
+                    for index in members[1:]
+                ]
+            results.append(representative)
+
+        self.logger.info(f"近似去重前: {len(items)} 条，合并后: {len(results)} 条")
+        return results
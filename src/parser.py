@@ -1,17 +1,106 @@
 """新闻解析器模块"""
+import asyncio
 import re
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, AsyncIterator
 from datetime import datetime
-from bs4 import BeautifulSoup
+from functools import lru_cache
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve
 import logging
 from urllib.parse import urljoin, urlparse
 
+from .utils import NewsUtils
+from .models import NewsItem
+
+try:
+    import lxml.html
+    from lxml import etree
+    from lxml.cssselect import CSSSelector
+    from cssselect import GenericTranslator
+    HAS_LXML_CSSSELECT = True
+except ImportError:
+    HAS_LXML_CSSSELECT = False
+
+
+# 解析引擎：BeautifulSoup + html.parser / BeautifulSoup + lxml / lxml.html + cssselect
+ENGINES = ('html.parser', 'lxml', 'lxml-cssselect')
+
+
+@lru_cache(maxsize=512)
+def _compile_soup_selector(selector: str):
+    """预编译 BeautifulSoup 使用的CSS选择器"""
+    return soupsieve.compile(selector)
+
+
+@lru_cache(maxsize=512)
+def _build_strainer(selector: str) -> Optional[SoupStrainer]:
+    """根据新闻项选择器生成 SoupStrainer，只为相关容器建树
+    
+    取选择器的第一个复合选择器（如 "div.list .item" 取 "div.list"）作为过滤条件，
+    匹配元素的整棵子树会被保留，后续仍按完整选择器查找。
+    无法安全推导（多个分组、兄弟组合符、伪类、属性选择器）时返回 None，即不限制。
+    """
+    if ',' in selector or '+' in selector or '~' in selector:
+        return None
+    
+    first = selector.strip().split()[0]
+    if first.startswith('>'):
+        return None
+    first = first.split('>')[0]
+    
+    match = re.fullmatch(r'([a-zA-Z][\w-]*)?((?:[.#][\w-]+)*)', first)
+    if not match or not first:
+        return None
+    
+    name, qualifiers = match.groups()
+    classes = re.findall(r'\.([\w-]+)', qualifiers or '')
+    ids = re.findall(r'#([\w-]+)', qualifiers or '')
+    
+    attrs = {}
+    if ids:
+        attrs['id'] = ids[0]
+    elif classes:
+        # 多个类时只按第一个类过滤，得到的是超集，完整选择器会再筛一遍；
+        # 建树时 class 属性还是完整字符串（如 "news-item summary"），按单词边界匹配
+        attrs['class'] = re.compile(rf'(?:^|\s){re.escape(classes[0])}(?:\s|$)')
+    
+    if not name and not attrs:
+        return None
+    if name in ('html', 'body') and not attrs:
+        return None
+    
+    return SoupStrainer(name or None, attrs=attrs)
+
+
+@lru_cache(maxsize=512)
+def _compile_lxml_selector(selector: str):
+    """预编译 lxml 使用的CSS选择器（编译为XPath）"""
+    return CSSSelector(selector)
+
+
+@lru_cache(maxsize=512)
+def _compile_lxml_subselector(selector: str):
+    """预编译新闻项内部的子选择器
+    
+    CSSSelector 编译为 descendant-or-self::，会匹配到新闻项元素本身；
+    子选择器改为只在后代中查找，与 soupsieve 的 select_one 一致。
+    """
+    return etree.XPath(GenericTranslator().css_to_xpath(selector, prefix='descendant::'))
+
 
 class NewsParser:
     """新闻解析器类"""
     
-    def __init__(self):
+    def __init__(self, cache: Optional[Any] = None, engine: str = 'html.parser',
+                 restrict_tree: bool = False):
         self.logger = self._setup_logger()
+        # HTTP条件请求缓存（HTTPCache），用于复用未更新源的解析结果
+        self.cache = cache
+        self.engine = self._resolve_engine(engine)
+        # 只为新闻项所在的容器建树（仅 BeautifulSoup 引擎）
+        self.restrict_tree = restrict_tree
+        self._executor = None
     
     def _setup_logger(self) -> logging.Logger:
         """设置日志"""
@@ -28,6 +117,53 @@ class NewsParser:
         
         return logger
     
+    def _resolve_engine(self, engine: str) -> str:
+        """校验解析引擎，不可用时回退到 html.parser"""
+        if engine not in ENGINES:
+            self.logger.warning(f"未知的解析引擎 '{engine}'，使用 html.parser")
+            return 'html.parser'
+        
+        if engine == 'lxml-cssselect' and not HAS_LXML_CSSSELECT:
+            self.logger.warning("未安装 lxml/cssselect，使用 html.parser")
+            return 'html.parser'
+        
+        return engine
+    
+    def _build_tree(self, content: str, item_selector: str):
+        """构建文档树"""
+        if self.engine == 'lxml-cssselect':
+            try:
+                return lxml.html.fromstring(content)
+            except ValueError:
+                # 带编码声明的XML文档不接受 str 输入
+                return lxml.html.fromstring(content.encode('utf-8'))
+        
+        strainer = _build_strainer(item_selector) if self.restrict_tree else None
+        return BeautifulSoup(content, self.engine, parse_only=strainer)
+    
+    def _worker_options(self) -> Dict[str, Any]:
+        """进程池中重建解析器所需的参数"""
+        return {'engine': self.engine, 'restrict_tree': self.restrict_tree}
+    
+    def _select(self, element, selector: str) -> list:
+        """按CSS选择器查找所有匹配元素"""
+        if self.engine == 'lxml-cssselect':
+            return _compile_lxml_selector(selector)(element)
+        return _compile_soup_selector(selector).select(element)
+    
+    def _select_one(self, element, selector: str):
+        """在新闻项内按CSS选择器查找第一个匹配的后代元素"""
+        if self.engine == 'lxml-cssselect':
+            matches = _compile_lxml_subselector(selector)(element)
+            return matches[0] if matches else None
+        return _compile_soup_selector(selector).select_one(element)
+    
+    def _get_text(self, element) -> str:
+        """获取元素文本"""
+        if self.engine == 'lxml-cssselect':
+            return element.text_content()
+        return element.get_text()
+    
     def _clean_text(self, text: str) -> str:
         """清理文本"""
         if not text:
@@ -47,7 +183,7 @@ class NewsParser:
     
     def _extract_link(self, element, base_url: str) -> Optional[str]:
         """提取链接"""
-        if not element:
+        if element is None:
             return None
         
         # 尝试不同的属性
@@ -66,28 +202,19 @@ class NewsParser:
     
     def _extract_text(self, element, selector: str) -> Optional[str]:
         """提取文本"""
-        if not element or not selector:
+        if element is None or not selector:
             return None
         
         try:
-            if selector.startswith('.'):
-                # CSS类选择器
-                result = element.select_one(selector)
-            elif selector.startswith('#'):
-                # ID选择器
-                result = element.select_one(selector)
-            else:
-                # 其他选择器
-                result = element.select_one(selector)
-            
-            if result:
-                return self._clean_text(result.get_text())
+            result = self._select_one(element, selector)
+            if result is not None:
+                return self._clean_text(self._get_text(result))
         except Exception as e:
             self.logger.warning(f"提取文本失败: {e}")
         
         return None
     
-    def parse_source(self, source_data: Dict[str, Any], source_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def parse_source(self, source_data: Dict[str, Any], source_config: Dict[str, Any]) -> List[NewsItem]:
         """解析单个新闻源"""
         name = source_data.get('name', 'Unknown')
         url = source_data.get('url', '')
@@ -99,7 +226,6 @@ class NewsParser:
             return []
         
         try:
-            soup = BeautifulSoup(content, 'html.parser')
             items = []
             
             # 获取选择器配置
@@ -112,14 +238,20 @@ class NewsParser:
                 self.logger.warning(f"新闻源 '{name}' 没有配置选择器")
                 return []
             
+            tree = self._build_tree(content, item_selector)
+            
+            # 同一源的所有新闻共用抓取时间，只解析一次
+            fetched_at = source_data.get('fetched_at')
+            published_ts = NewsUtils.parse_timestamp(fetched_at)
+            
             # 查找所有新闻项
-            elements = soup.select(item_selector)
+            elements = self._select(tree, item_selector)
             self.logger.info(f"在 '{name}' 中找到 {len(elements)} 个新闻项")
             
             for element in elements[:20]:  # 限制每源最多20条
                 try:
                     # 提取链接
-                    link_element = element.select_one(link_selector) if link_selector else element
+                    link_element = self._select_one(element, link_selector) if link_selector else element
                     link = self._extract_link(link_element, url)
                     
                     # 提取标题
@@ -132,19 +264,19 @@ class NewsParser:
                     if not title or not link:
                         continue
                     
-                    # 生成唯一ID
-                    item_id = f"{name}_{hash(link)}_{hash(title)}"
+                    # 生成唯一ID（规范化链接的稳定哈希，跨运行不变）
+                    item_id = NewsUtils.stable_id(link)
                     
-                    item = {
-                        'id': item_id,
-                        'title': title,
-                        'link': link,
-                        'description': description or title,
-                        'source': name,
-                        'category': category,
-                        'published_at': source_data.get('fetched_at'),
-                        'fetched_at': source_data.get('fetched_at')
-                    }
+                    item = NewsItem(
+                        id=item_id,
+                        title=title,
+                        link=link,
+                        description=description or title,
+                        source=name,
+                        category=category,
+                        published_ts=published_ts,
+                        fetched_ts=published_ts
+                    )
                     
                     items.append(item)
                     
@@ -159,31 +291,65 @@ class NewsParser:
             self.logger.error(f"解析新闻源 '{name}' 失败: {e}")
             return []
     
+    def _find_source_config(self, source_name: str, sources_config: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """查找新闻源对应的配置"""
+        for config in sources_config:
+            if config.get('name') == source_name:
+                return config
+        
+        self.logger.warning(f"未找到新闻源 '{source_name}' 的配置")
+        return None
+    
+    def _get_cached_items(self, source_data: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """源未更新（304、内容指纹未变化或未到轮询时间）时获取上次的解析结果"""
+        if not source_data.get('not_modified') or not self.cache:
+            return None
+        
+        cached_items = self.cache.get_items(source_data.get('url', ''))
+        if cached_items is not None:
+            self.logger.info(f"'{source_data.get('name')}' 未更新，复用上次解析结果: {len(cached_items)} 条")
+        return cached_items
+    
     def parse_all(self, sources_data: List[Dict[str, Any]], sources_config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """解析所有新闻源"""
         all_items = []
         
         for source_data in sources_data:
-            source_name = source_data.get('name')
-            
-            # 查找对应的配置
-            source_config = None
-            for config in sources_config:
-                if config.get('name') == source_name:
-                    source_config = config
-                    break
-            
+            source_config = self._find_source_config(source_data.get('name'), sources_config)
             if not source_config:
-                self.logger.warning(f"未找到新闻源 '{source_name}' 的配置")
+                continue
+            
+            # 源未更新时跳过解析，复用上次的结果
+            cached_items = self._get_cached_items(source_data)
+            if cached_items is not None:
+                all_items.extend(cached_items)
                 continue
             
             items = self.parse_source(source_data, source_config)
+            if self.cache:
+                self.cache.store_items(source_data.get('url', ''), items)
             all_items.extend(items)
         
         return all_items
     
+    def _get_executor(self, workers: int) -> ProcessPoolExecutor:
+        """获取解析进程池（按需创建，多次解析复用）"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+        return self._executor
+    
+    def close(self):
+        """关闭解析进程池"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
     def parse_category_data(self, category_data: Dict[str, Any], config: Any) -> Dict[str, List[Dict[str, Any]]]:
         """解析分类数据"""
+        workers = config.get_parser_config().get('workers', 0)
+        if workers > 1:
+            return self._parse_category_data_parallel(category_data, config, workers)
+        
         results = {}
         
         for category, sources_data in category_data.items():
@@ -200,6 +366,107 @@ class NewsParser:
         
         return results
     
+    def _parse_category_data_parallel(self, category_data: Dict[str, Any], config: Any,
+                                      workers: int) -> Dict[str, List[Dict[str, Any]]]:
+        """在进程池中并行解析分类数据，输出顺序与串行解析一致"""
+        # 每个分类按源顺序保留一个结果槽位，需要解析的源登记为任务
+        slots = {}
+        jobs = []
+        
+        for category, sources_data in category_data.items():
+            sources_config = config.get_enabled_sources(category)
+            slots[category] = []
+            
+            for source_data in sources_data or []:
+                source_config = self._find_source_config(source_data.get('name'), sources_config)
+                if not source_config:
+                    continue
+                
+                cached_items = self._get_cached_items(source_data)
+                if cached_items is not None:
+                    slots[category].append(cached_items)
+                    continue
+                
+                jobs.append((category, len(slots[category]), source_data, source_config))
+                slots[category].append([])
+        
+        if jobs:
+            self.logger.info(f"使用 {workers} 个进程并行解析 {len(jobs)} 个新闻源")
+            executor = self._get_executor(workers)
+            parsed = executor.map(
+                _parse_source_worker,
+                [job[2] for job in jobs],
+                [job[3] for job in jobs],
+                [self._worker_options()] * len(jobs)
+            )
+            
+            for (category, index, source_data, _), items in zip(jobs, parsed):
+                slots[category][index] = items
+                if self.cache:
+                    self.cache.store_items(source_data.get('url', ''), items)
+        
+        return {
+            category: [item for items in category_slots for item in items]
+            for category, category_slots in slots.items()
+        }
+    
+    async def parse_stream(self, stream: AsyncIterator[Dict[str, Any]], config: Any) -> Dict[str, List[Dict[str, Any]]]:
+        """流水线解析：每收到一个抓取结果立即交给解析工作者，解析完即释放原始页面
+        
+        同时在解析的页面数受限，解析跟不上时会反压抓取端，峰值内存与并发度成正比。
+        workers 大于 1 时在进程池中解析，否则在线程池中解析，均不阻塞事件循环。
+        """
+        workers = config.get_parser_config().get('workers', 0)
+        executor = self._get_executor(workers) if workers > 1 else None
+        loop = asyncio.get_running_loop()
+        parse_slots = asyncio.Semaphore(max(workers, 1) * 2)
+        parsed = {}
+        tasks = []
+        
+        async def parse_one(source_data: Dict[str, Any], source_config: Dict[str, Any]):
+            try:
+                items = self._get_cached_items(source_data)
+                if items is None:
+                    if executor:
+                        items = await loop.run_in_executor(
+                            executor, _parse_source_worker, source_data, source_config, self._worker_options()
+                        )
+                    else:
+                        items = await loop.run_in_executor(None, self.parse_source, source_data, source_config)
+                    if self.cache:
+                        self.cache.store_items(source_data.get('url', ''), items)
+                parsed[source_data.get('category')][source_data.get('name')] = items
+            except Exception as e:
+                self.logger.error(f"解析新闻源 '{source_data.get('name')}' 失败: {e}")
+            finally:
+                # 解析完成即释放原始页面
+                source_data.pop('content', None)
+                parse_slots.release()
+        
+        async for source_data in stream:
+            category = source_data.get('category')
+            source_config = self._find_source_config(source_data.get('name'), config.get_enabled_sources(category))
+            if not source_config:
+                continue
+            
+            parsed.setdefault(category, {})
+            await parse_slots.acquire()
+            tasks.append(asyncio.ensure_future(parse_one(source_data, source_config)))
+        
+        await asyncio.gather(*tasks)
+        
+        # 按配置中的源顺序组装，输出与非流水线解析一致
+        results = {}
+        for category in config.get_categories():
+            by_name = parsed.get(category, {})
+            results[category] = [
+                item
+                for source_config in config.get_enabled_sources(category)
+                for item in by_name.get(source_config.get('name'), [])
+            ]
+        
+        return results
+    
     def deduplicate_items(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """去重新闻项"""
         seen_links = set()
@@ -220,14 +487,12 @@ class NewsParser:
         filtered_items = []
         
         for item in items:
-            try:
-                published_str = item.get('published_at')
-                if published_str:
-                    published_dt = datetime.fromisoformat(published_str.replace('Z', '+00:00'))
-                    if published_dt.timestamp() >= cutoff_time:
-                        filtered_items.append(item)
-            except:
-                # 如果解析时间失败，保留该项
+            published_ts = NewsUtils.item_timestamp(item)
+            if published_ts is None:
+                # 如果解析时间失败，保留该项；没有发布时间则丢弃
+                if item.get('published_at'):
+                    filtered_items.append(item)
+            elif published_ts >= cutoff_time:
                 filtered_items.append(item)
         
         self.logger.info(f"时间过滤前: {len(items)} 条，过滤后: {len(filtered_items)} 条")
@@ -235,14 +500,28 @@ class NewsParser:
     
     def sort_items(self, items: List[Dict[str, Any]], sort_by: str = 'published_at') -> List[Dict[str, Any]]:
         """排序新闻项"""
+        # 没有发布时间的新闻视为最新
+        now = datetime.now().timestamp()
+        
         def get_sort_key(item):
             if sort_by == 'published_at':
-                try:
-                    published_str = item.get('published_at')
-                    if published_str:
-                        return datetime.fromisoformat(published_str.replace('Z', '+00:00'))
-                except:
-                    pass
-            return datetime.now()
-        
-        return sorted(items, key=get_sort_key, reverse=True)
\ No newline at end of file
+                published_ts = NewsUtils.item_timestamp(item)
+                if published_ts is not None:
+                    return published_ts
+            return now
+        
+        return sorted(items, key=get_sort_key, reverse=True)
+
+
+# 进程池工作进程内按参数复用的解析器实例
+_worker_parsers = {}
+
+
+def _parse_source_worker(source_data: Dict[str, Any], source_config: Dict[str, Any],
+                         options: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """进程池任务：解析单个新闻源"""
+    options = options or {}
+    key = tuple(sorted(options.items()))
+    if key not in _worker_parsers:
+        _worker_parsers[key] = NewsParser(**options)
+    return _worker_parsers[key].parse_source(source_data, source_config)
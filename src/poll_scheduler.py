@@ -0,0 +1,93 @@
+"""自适应轮询模块"""
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from .utils import NewsUtils
+
+
+class PollScheduler:
+    """按源学习更新频率，决定每个源下一次抓取的时间
+
+    每次抓取后比较内容指纹：内容有变化时轮询间隔乘以 speedup（缩短），没有变化时
+    乘以 backoff（延长），限制在 [min_interval, max_interval] 之间。间隔会收敛到该源
+    实际更新周期附近：更新频繁的源每次运行都抓取，很少更新的源逐渐拉长间隔，
+    未到时间的源跳过请求和解析，直接复用上次的解析结果。
+    状态持久化在 data_dir/poll_state.json。
+    """
+
+    # 距下次轮询不足间隔的该比例时也视为到期，避免调度时间的细小抖动跳过一次运行
+    DUE_TOLERANCE = 0.1
+
+    def __init__(self, state_file: str, polling_config: Optional[Dict[str, Any]] = None):
+        self.state_file = Path(state_file)
+        self.logger = logging.getLogger(__name__)
+
+        polling_config = polling_config or {}
+        self.enabled = polling_config.get('enabled', True)
+        self.min_interval = polling_config.get('min_interval', 300)
+        self.max_interval = max(polling_config.get('max_interval', 43200), self.min_interval)
+        self.speedup = polling_config.get('speedup', 0.5)
+        self.backoff = polling_config.get('backoff', 1.5)
+
+        # URL -> {fingerprint, interval, last_polled, last_changed, polls, changes}
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        if self.state_file.exists():
+            self.sources = NewsUtils.load_json_file(str(self.state_file))
+
+    def is_due(self, url: str, now: Optional[float] = None) -> bool:
+        """该源本次是否需要抓取"""
+        entry = self.sources.get(url)
+        if not self.enabled or not entry or not entry.get('last_polled'):
+            return True
+
+        now = now if now is not None else time.time()
+        interval = entry['interval']
+        return now - entry['last_polled'] >= interval * (1 - self.DUE_TOLERANCE)
+
+    def record(self, url: str, fingerprint: str, now: Optional[float] = None) -> bool:
+        """记录一次抓取结果，返回内容是否有变化"""
+        now = now if now is not None else time.time()
+        entry = self.sources.get(url)
+
+        if entry is None:
+            entry = {
+                'fingerprint': fingerprint,
+                'interval': self.min_interval,
+                'last_polled': now,
+                'last_changed': now,
+                'polls': 1,
+                'changes': 1
+            }
+            self.sources[url] = entry
+            return True
+
+        changed = fingerprint != entry.get('fingerprint')
+        factor = self.speedup if changed else self.backoff
+        entry['interval'] = min(max(entry['interval'] * factor, self.min_interval), self.max_interval)
+        entry['fingerprint'] = fingerprint
+        entry['last_polled'] = now
+        entry['polls'] = entry.get('polls', 0) + 1
+        if changed:
+            entry['last_changed'] = now
+            entry['changes'] = entry.get('changes', 0) + 1
+        return changed
+
+    def report(self, url: str, now: Optional[float] = None) -> Dict[str, Any]:
+        """单个源的轮询状态摘要（用于运行统计）"""
+        entry = self.sources.get(url)
+        if not entry:
+            return {'interval': None, 'next_poll_in': 0, 'change_rate': None}
+
+        now = now if now is not None else time.time()
+        return {
+            'interval': round(entry['interval']),
+            'next_poll_in': max(round(entry['last_polled'] + entry['interval'] - now), 0),
+            # 有变化的抓取占比
+            'change_rate': round(entry.get('changes', 0) / entry['polls'], 2) if entry.get('polls') else None
+        }
+
+    def save(self):
+        """保存轮询状态"""
+        NewsUtils.save_json_file(self.sources, str(self.state_file), indent=None)
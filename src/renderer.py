@@ -0,0 +1,96 @@
+"""渲染阶段模块"""
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Any, List, Optional
+
+from .utils import NewsUtils
+
+
+class RenderStage:
+    """并发渲染所有RSS和HTML产物
+
+    各分类订阅源、总订阅源、首页、各分类页面和订阅页面互不依赖（页面中的订阅链接
+    只需要文件路径），全部作为独立任务提交到线程池，渲染和文件写入都不占用事件循环线程。
+    任务数随分类和页面数量增长，线程数由 render.workers 控制。
+    分类页面的每一页、每个需要更新的归档日期也都是独立任务。
+    """
+
+    def __init__(self, config: Any, rss_generator: Any, html_generator: Any):
+        self.config = config
+        self.rss_generator = rss_generator
+        self.html_generator = html_generator
+        self.workers = config.get_render_config().get('workers', 4)
+        self.logger = logging.getLogger(__name__)
+
+    async def run(self, categorized_items: Dict[str, List[Dict[str, Any]]],
+                  archive: Optional[Any] = None) -> Dict[str, Any]:
+        """渲染全部产物，返回各产物的文件路径"""
+        start_time = time.time()
+        output_dirs = self.config.get_output_dirs()
+        rss_dir, html_dir = output_dirs['rss'], output_dirs['html']
+
+        categories = [category for category, items in categorized_items.items() if items]
+        rss_files = self.rss_generator.feed_files(categories, rss_dir)
+
+        # 总订阅源：k路归并各分类已排序的列表，只取需要的条数
+        all_items = NewsUtils.merge_sorted_items(
+            categorized_items.values(),
+            self.config.get_rss_config().get('max_items_per_feed', 50)
+        )
+
+        jobs = {}
+        for category in categories:
+            jobs[('rss', category)] = partial(
+                self.rss_generator.generate_feed, category, categorized_items[category], rss_dir
+            )
+            for page in range(1, self.html_generator.page_count(categorized_items[category]) + 1):
+                jobs[('category_page', category, page)] = partial(
+                    self.html_generator.generate_category_page,
+                    category, categorized_items[category], rss_files, html_dir, page
+                )
+        if all_items:
+            jobs[('rss', 'all')] = partial(self.rss_generator.generate_feed, 'all', all_items, rss_dir)
+        jobs[('main_page', None)] = partial(
+            self.html_generator.generate_main_page, categorized_items, rss_files, html_dir
+        )
+        jobs[('feeds_page', None)] = partial(self.html_generator.generate_feeds_page, rss_files, html_dir)
+
+        if archive is not None:
+            # 过期日期的页面先删除；只有内容变化的日期需要读取归档并重新生成
+            self.html_generator.remove_archive_pages(archive.expired_days, html_dir)
+            for day in self.html_generator.archive_days_to_render(archive, html_dir):
+                jobs[('archive_day', day)] = partial(self._render_archive_day, archive, day, html_dir)
+            jobs[('archive_index', None)] = partial(
+                self.html_generator.generate_archive_index,
+                [(day, archive.index[day]) for day in archive.days()], html_dir
+            )
+
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=max(self.workers, 1), thread_name_prefix='render') as executor:
+            paths = await asyncio.gather(*(loop.run_in_executor(executor, job) for job in jobs.values()))
+
+        # 各订阅源和页面的指纹在全部任务完成后统一保存
+        self.rss_generator.save_state()
+        self.html_generator.save_state()
+
+        results = {
+            'rss_files': rss_files, 'category_pages': {}, 'main_page': '', 'feeds_page': '',
+            'archive_pages': [], 'archive_index': ''
+        }
+        for (kind, name, *page), path in zip(jobs, paths):
+            if kind == 'category_page' and page == [1]:
+                results['category_pages'][name] = path
+            elif kind == 'archive_day':
+                results['archive_pages'].append(path)
+            elif kind in ('main_page', 'feeds_page', 'archive_index'):
+                results[kind] = path
+
+        self.logger.info(f"渲染完成: {len(jobs)} 个产物，耗时 {time.time() - start_time:.2f} 秒")
+        return results
+
+    def _render_archive_day(self, archive: Any, day: str, html_dir: str) -> str:
+        """读取某天的归档并生成页面（在线程池中执行）"""
+        return self.html_generator.generate_archive_day(day, archive.get_day(day), html_dir)
@@ -1,18 +1,61 @@
 """RSS订阅源生成器模块"""
-from feedgen.feed import FeedGenerator
 from typing import List, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
+import hashlib
+import json
 import logging
 
+from .utils import NewsUtils
+from .feed_writer import StreamingFeedWriter
+
+try:
+    from feedgen.feed import FeedGenerator
+    HAS_FEEDGEN = True
+except ImportError:
+    HAS_FEEDGEN = False
+
 
 class RSSGenerator:
-    """RSS生成器类"""
+    """RSS生成器类
+    
+    增量生成：每个订阅源按有序的新闻条目（及RSS配置）计算指纹，与上次运行保存的指纹相同
+    且文件仍存在时跳过渲染和写入，文件修改时间不变；只有内容变化时才重写并更新 lastBuildDate。
+    新闻的发布时间是抓取时间（开启 deduplicate 时为首次出现时间），不来自新闻来源，不计入指纹：
+    关闭 deduplicate 时它每次运行都不同，计入后订阅源每次都会重写；内容未变化而跳过的订阅源
+    保留上次写入时的发布时间。
+    
+    默认使用流式写入器（StreamingFeedWriter），可额外输出 Atom 和 JSON Feed；
+    rss.writer 设为 feedgen 时 RSS 仍由 feedgen 生成（需安装 feedgen）。
+    """
     
     def __init__(self, config: Any):
         self.config = config
         self.rss_config = config.get_rss_config()
         self.logger = self._setup_logger()
+        
+        # 各订阅源上次写入时的指纹和生成时间
+        self.incremental = self.rss_config.get('incremental', True)
+        self.state_file = Path(config.get_output_dirs()['data']) / 'rss_state.json'
+        self.feed_state: Dict[str, Dict[str, Any]] = {}
+        if self.incremental and self.state_file.exists():
+            self.feed_state = NewsUtils.load_json_file(str(self.state_file))
+        
+        # 本次运行报告：重写了哪些订阅源，哪些未变化
+        self.run_report: Dict[str, List[str]] = {'rewritten': [], 'unchanged': []}
+        
+        self.writer = self.rss_config.get('writer', 'stream')
+        if self.writer == 'feedgen' and not HAS_FEEDGEN:
+            self.logger.warning("未安装 feedgen，改用流式写入器")
+            self.writer = 'stream'
+        
+        # RSS 始终输出（页面中的订阅链接指向它），atom / json 为可选的附加格式
+        self.formats = ['rss'] + [
+            fmt for fmt in self.rss_config.get('formats', []) if fmt != 'rss'
+        ]
+        for fmt in self.formats:
+            if fmt not in StreamingFeedWriter.EXTENSIONS:
+                raise ValueError(f"不支持的订阅源格式: {fmt}")
     
     def _setup_logger(self) -> logging.Logger:
         """设置日志"""
@@ -29,38 +72,70 @@ class RSSGenerator:
         
         return logger
     
-    def create_feed(self, category: str, items: List[Dict[str, Any]]) -> FeedGenerator:
+    def _feed_info(self, name: str) -> Dict[str, Any]:
+        """订阅源基本信息（name 为分类名，all 表示总订阅源）"""
+        if name == 'all':
+            title = "新闻聚合器 - 所有分类"
+            description = "自动聚合的所有分类新闻"
+        else:
+            title = f"新闻聚合器 - {name.upper()} 分类"
+            description = f"自动聚合的 {name} 分类新闻"
+        
+        repo = self.config.config.get('github_repo', 'your-username/news-aggregator')
+        # 订阅源发布地址，默认为仓库的 GitHub Pages 地址
+        owner, _, project = repo.partition('/')
+        base_url = self.rss_config.get('base_url') or f"https://{owner}.github.io/{project}/rss"
+        
+        return {
+            # 各订阅源唯一的永久ID（Atom 阅读器按ID区分订阅源）
+            'id': f"urn:news-aggregator:feed:{name.lower()}",
+            # 订阅源文件地址（不含扩展名，各格式追加各自的扩展名）
+            'feed_url': f"{base_url.rstrip('/')}/{name.lower()}",
+            'title': title,
+            'description': description,
+            'link': f"https://github.com/{repo}",
+            'language': self.rss_config.get('language', 'zh-CN'),
+            'author': self.rss_config.get('author', 'Auto News Aggregator'),
+            'ttl': self.rss_config.get('ttl', 180),
+            'category': None if name == 'all' else name,
+            # 生成时间取内容变化的时刻，内容不变时不会重新生成
+            'last_build': self._build_time(name)
+        }
+    
+    def create_feed(self, category: str, items: List[Dict[str, Any]]) -> 'FeedGenerator':
         """创建RSS feed"""
+        if not HAS_FEEDGEN:
+            raise ImportError("使用 feedgen 生成RSS需要安装 feedgen")
+        
+        info = self._feed_info(category)
         fg = FeedGenerator()
         
         # 基本信息
-        title = f"新闻聚合器 - {category.upper()} 分类"
-        description = f"自动聚合的 {category} 分类新闻"
-        link = f"https://github.com/{self.config.get('github_repo', 'your-username/news-aggregator')}"
-        
-        fg.title(title)
-        fg.description(description)
-        fg.link(href=link, rel='alternate')
-        fg.language(self.rss_config.get('language', 'zh-CN'))
-        fg.author({'name': self.rss_config.get('author', 'Auto News Aggregator')})
+        fg.title(info['title'])
+        fg.description(info['description'])
+        fg.link(href=info['link'], rel='alternate')
+        fg.language(info['language'])
+        fg.author({'name': info['author']})
         
         # 添加TTL
-        ttl = self.rss_config.get('ttl', 180)
-        fg.ttl(ttl)
+        fg.ttl(info['ttl'])
         
         # 添加分类信息
-        fg.category(category)
+        if info['category']:
+            fg.category({'term': info['category']})
+        
+        fg.lastBuildDate(info['last_build'])
         
         return fg
     
-    def add_entry(self, fg: FeedGenerator, item: Dict[str, Any]):
+    def add_entry(self, fg: 'FeedGenerator', item: Dict[str, Any]):
         """添加RSS条目"""
         fe = fg.add_entry()
         
         title = item.get('title', '无标题')
         link = item.get('link', '')
         description = item.get('description', '')
-        published_at = item.get('published_at')
+        published_ts = NewsUtils.item_timestamp(item)
         source = item.get('source', 'Unknown')
         
         fe.title(title)
@@ -68,13 +143,11 @@ class RSSGenerator:
         fe.description(description)
         fe.source(source)
         
-        # 设置发布时间
-        if published_at:
-            try:
-                pub_date = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-                fe.pubDate(pub_date)
-            except:
-                fe.pubDate(datetime.now())
+        # 设置发布时间（使用解析阶段预先计算的时间戳，feedgen 要求带时区）
+        if item.get('published_at'):
+            if published_ts is None:
+                published_ts = datetime.now().timestamp()
+            fe.pubDate(datetime.fromtimestamp(published_ts, timezone.utc))
         
         # 添加唯一ID
         item_id = item.get('id')
@@ -102,7 +175,7 @@ class RSSGenerator:
             self.add_entry(fg, item)
         
         # 生成RSS XML
-        rss_feed = fg.rss_str(pretty=True)
+        rss_feed = fg.rss_str(pretty=True).decode('utf-8')
         
         self.logger.info(f"生成分类 '{category}' RSS，包含 {len(limited_items)} 条新闻")
         
@@ -113,78 +186,135 @@ class RSSGenerator:
         if not rss_feed:
             return
         
-        # 创建输出目录
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
-        
         # 生成文件名
-        filename = f"{category.lower()}.xml"
-        filepath = output_path / filename
+        filepath = self._feed_path(category, output_dir)
         
-        # 保存文件
-        with open(filepath, 'w', encoding='utf-8') as f:
+        # 保存文件（先写临时文件再替换）
+        with NewsUtils.atomic_write(str(filepath)) as f:
             f.write(rss_feed)
         
         self.logger.info(f"RSS已保存到: {filepath}")
         
         return str(filepath)
     
+    def _feed_path(self, name: str, output_dir: str, fmt: str = 'rss') -> Path:
+        """订阅源文件路径"""
+        return Path(output_dir) / f"{name.lower()}{StreamingFeedWriter.EXTENSIONS[fmt]}"
+    
+    def write_feed(self, name: str, items: List[Dict[str, Any]], output_dir: str = "rss") -> str:
+        """写出一个订阅源的所有格式，返回RSS文件路径"""
+        info = self._feed_info(name)
+        writer = StreamingFeedWriter(info)
+        
+        for fmt in self.formats:
+            if fmt == 'rss' and self.writer == 'feedgen':
+                fg = self.create_feed(name, items)
+                for item in items:
+                    self.add_entry(fg, item)
+                self.save_rss(fg.rss_str(pretty=True).decode('utf-8'), name, output_dir)
+            else:
+                writer.write(str(self._feed_path(name, output_dir, fmt)), items, fmt)
+        
+        filepath = str(self._feed_path(name, output_dir))
+        self.logger.info(f"订阅源已保存到: {filepath}，包含 {len(items)} 条新闻")
+        return filepath
+    
+    # 订阅源指纹包含的新闻项字段：条目中来自新闻来源的全部字段（不含发布时间）
+    FINGERPRINT_FIELDS = ('id', 'title', 'link', 'description', 'source')
+    
+    def _fingerprint(self, items: List[Dict[str, Any]]) -> str:
+        """订阅源指纹：有序的新闻条目 + 影响输出的RSS配置
+        
+        标题、摘要等字段修正后新闻ID不变，只比较ID会一直输出旧内容。
+        """
+        digest = hashlib.sha1(json.dumps(self.rss_config, sort_keys=True, default=str).encode('utf-8'))
+        for item in items:
+            fields = [item.get(field) for field in self.FINGERPRINT_FIELDS]
+            digest.update(b'\0')
+            digest.update(json.dumps(fields, ensure_ascii=False, default=str).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _is_unchanged(self, name: str, fingerprint: str, output_dir: str) -> bool:
+        """订阅源内容是否与上次写入时相同"""
+        if not self.incremental:
+            return False
+        
+        state = self.feed_state.get(name)
+        return (
+            state is not None
+            and state.get('fingerprint') == fingerprint
+            and all(self._feed_path(name, output_dir, fmt).exists() for fmt in self.formats)
+        )
+    
+    def _build_time(self, name: str) -> datetime:
+        """订阅源的 lastBuildDate"""
+        state = self.feed_state.get(name) or {}
+        if state.get('last_build'):
+            return datetime.fromtimestamp(state['last_build'], timezone.utc)
+        return datetime.now(timezone.utc)
+    
+    def _record_build(self, name: str, fingerprint: str):
+        """记录订阅源已重写"""
+        self.feed_state[name] = {'fingerprint': fingerprint, 'last_build': datetime.now().timestamp()}
+        self.run_report['rewritten'].append(name)
+    
+    def save_state(self):
+        """保存订阅源指纹，供下次运行比较"""
+        if self.incremental and self.run_report['rewritten']:
+            NewsUtils.save_json_file(self.feed_state, str(self.state_file))
+    
+    def feed_files(self, categories: List[str], output_dir: str = "rss") -> Dict[str, str]:
+        """各分类RSS文件路径（不生成文件）"""
+        return {category: str(self._feed_path(category, output_dir)) for category in categories}
+    
+    def generate_feed(self, name: str, items: List[Dict[str, Any]], output_dir: str = "rss") -> str:
+        """生成单个订阅源（内容未变化时跳过），返回RSS文件路径
+        
+        各订阅源互不依赖，可在线程池中并发调用；全部完成后调用一次 save_state。
+        """
+        max_items = self.rss_config.get('max_items_per_feed', 50)
+        limited_items = items[:max_items]
+        
+        fingerprint = self._fingerprint(limited_items)
+        if self._is_unchanged(name, fingerprint, output_dir):
+            self.logger.info(f"订阅源 '{name}' 内容未变化，跳过生成")
+            self.run_report['unchanged'].append(name)
+            return str(self._feed_path(name, output_dir))
+        
+        self._record_build(name, fingerprint)
+        return self.write_feed(name, limited_items, output_dir)
+    
     def generate_all_rss(self, categorized_items: Dict[str, List[Dict[str, Any]]], output_dir: str = "rss") -> Dict[str, str]:
-        """生成所有分类的RSS"""
+        """生成所有分类的RSS（内容未变化的分类跳过）"""
         output_files = {}
         
         for category, items in categorized_items.items():
             if not items:
                 continue
-            
-            rss_feed = self.generate_category_rss(category, items)
-            if rss_feed:
-                filepath = self.save_rss(rss_feed, category, output_dir)
-                if filepath:
-                    output_files[category] = filepath
-        
-        self.logger.info(f"RSS生成完成，共生成 {len(output_files)} 个文件")
+            output_files[category] = self.generate_feed(category, items, output_dir)
+        
+        self.save_state()
+        self.logger.info(
+            f"RSS生成完成，共 {len(output_files)} 个文件，"
+            f"重写 {len(self.run_report['rewritten'])} 个"
+        )
         return output_files
     
     def generate_index_rss(self, all_items: List[Dict[str, Any]], output_dir: str = "rss") -> str:
-        """生成总RSS（包含所有分类）"""
+        """生成总RSS（包含所有分类）
+        
+        all_items 需已按发布时间倒序排列，可用 NewsUtils.merge_sorted_items 归并各分类列表。
+        """
         if not all_items:
             self.logger.warning("没有新闻项，跳过总RSS生成")
             return ""
         
-        # 按时间排序
-        sorted_items = sorted(
-            all_items,
-            key=lambda x: x.get('published_at', ''),
-            reverse=True
-        )
-        
-        # 限制条目数量
-        max_items = self.rss_config.get('max_items_per_feed', 50)
-        limited_items = sorted_items[:max_items]
-        
-        # 创建feed
-        fg = FeedGenerator()
-        fg.title("新闻聚合器 - 所有分类")
-        fg.description("自动聚合的所有分类新闻")
-        fg.link(href="https://github.com/your-username/news-aggregator", rel='alternate')
-        fg.language(self.rss_config.get('language', 'zh-CN'))
-        fg.author({'name': self.rss_config.get('author', 'Auto News Aggregator')})
-        fg.ttl(self.rss_config.get('ttl', 180))
-        
-        # 添加条目
-        for item in limited_items:
-            self.add_entry(fg, item)
-        
-        # 生成RSS XML
-        rss_feed = fg.rss_str(pretty=True)
-        
-        # 保存文件
-        filepath = self.save_rss(rss_feed, "all", output_dir)
+        filepath = self.generate_feed('all', all_items, output_dir)
+        self.save_state()
         
-        self.logger.info(f"总RSS生成完成，包含 {len(limited_items)} 条新闻")
+        self.logger.info("总RSS生成完成")
         
-        return filepath if filepath else ""
+        return filepath
     
     def generate_feed_urls(self, base_url: str, categories: List[str]) -> Dict[str, str]:
         """生成RSS订阅链接"""
@@ -0,0 +1,97 @@
+"""定时调度模块"""
+from datetime import datetime, timedelta
+from typing import List, Set
+
+
+class CronExpression:
+    """五段式 cron 表达式（分 时 日 月 周）
+
+    支持 *、数字、范围 a-b、步长 */n 和 a-b/n 以及逗号分隔的列表；
+    周的取值为 0-7（0 和 7 都表示周日）。日和周都被限定时，两者满足其一即可（与 cron 相同）。
+    """
+
+    # 各字段的取值范围
+    FIELDS = (
+        ('minute', 0, 59),
+        ('hour', 0, 23),
+        ('day', 1, 31),
+        ('month', 1, 12),
+        ('weekday', 0, 7),
+    )
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"cron 表达式必须包含5个字段: {expression}")
+
+        values = {}
+        for (name, low, high), part in zip(self.FIELDS, parts):
+            values[name] = self._parse_field(part, low, high)
+
+        self.minutes = values['minute']
+        self.hours = values['hour']
+        self.days = values['day']
+        self.months = values['month']
+        # cron 中周日为 0 或 7，转换为 Python 的 weekday()（周一为 0）
+        self.weekdays = {(day - 1) % 7 for day in values['weekday']}
+
+        self.day_restricted = parts[2] != '*'
+        self.weekday_restricted = parts[4] != '*'
+
+    @staticmethod
+    def _parse_field(part: str, low: int, high: int) -> Set[int]:
+        """解析单个字段为取值集合"""
+        values = set()
+        for item in part.split(','):
+            step = 1
+            if '/' in item:
+                item, step_text = item.split('/', 1)
+                step = int(step_text)
+                if step <= 0:
+                    raise ValueError(f"cron 步长必须为正数: {part}")
+
+            if item == '*':
+                start, end = low, high
+            elif '-' in item:
+                start_text, end_text = item.split('-', 1)
+                start, end = int(start_text), int(end_text)
+            else:
+                start = int(item)
+                # 带步长的单个数字表示从该值开始到上限
+                end = high if step > 1 else start
+
+            if start < low or end > high or start > end:
+                raise ValueError(f"cron 字段超出范围 {low}-{high}: {part}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_match = moment.day in self.days
+        weekday_match = moment.weekday() in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_match or weekday_match
+        return day_match and weekday_match
+
+    def next_after(self, moment: datetime) -> datetime:
+        """moment 之后（不含）的下一个触发时刻，精确到分钟"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+
+        # 逐日跳过不匹配的日期，日内逐小时、逐分钟查找；最多查找约五年
+        for _ in range(366 * 5):
+            if candidate.month in self.months and self._day_matches(candidate):
+                for hour in sorted(h for h in self.hours if h >= candidate.hour):
+                    start_minute = candidate.minute if hour == candidate.hour else 0
+                    for minute in sorted(m for m in self.minutes if m >= start_minute):
+                        return candidate.replace(hour=hour, minute=minute)
+            candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+
+        raise ValueError(f"cron 表达式没有可触发的时刻: {self.expression}")
+
+    def __repr__(self) -> str:
+        return f"CronExpression({self.expression!r})"
+
+
+def next_run_time(expressions: List[CronExpression], moment: datetime) -> datetime:
+    """多个 cron 表达式中最早的下一个触发时刻"""
+    return min(expression.next_after(moment) for expression in expressions)
@@ -0,0 +1,112 @@
+"""已见新闻持久化存储模块"""
+import logging
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List
+
+from .utils import NewsUtils
+
+
+class SeenStore:
+    """跨运行的已见新闻存储
+
+    以新闻的稳定ID（规范化链接的哈希）为键保存首次和最近出现时间，
+    打开时把所有ID载入内存，成员判断为 O(1)；超过 keep_days 未再出现的记录会被淘汰。
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_items ("
+            "id TEXT PRIMARY KEY, link TEXT, category TEXT, first_seen REAL, last_seen REAL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_last_seen ON seen_items (last_seen)")
+
+        # id -> 首次出现时间
+        self._first_seen: Dict[str, float] = dict(
+            self.conn.execute("SELECT id, first_seen FROM seen_items")
+        )
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._first_seen
+
+    def __len__(self) -> int:
+        return len(self._first_seen)
+
+    def evict(self, keep_days: int) -> int:
+        """淘汰超过 keep_days 未再出现的记录"""
+        cutoff = time.time() - keep_days * 86400
+        expired = [
+            row[0] for row in self.conn.execute("SELECT id FROM seen_items WHERE last_seen < ?", (cutoff,))
+        ]
+        if expired:
+            self.conn.execute("DELETE FROM seen_items WHERE last_seen < ?", (cutoff,))
+            self.conn.commit()
+            for item_id in expired:
+                self._first_seen.pop(item_id, None)
+            self.logger.info(f"已淘汰 {len(expired)} 条过期的已见记录")
+        return len(expired)
+
+    def deduplicate(self, categorized_items: Dict[str, List[Dict[str, Any]]],
+                    skip_known: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        """跨分类、跨运行去重
+
+        同一条新闻在本次运行中只保留第一次出现的分类；以前运行中见过的新闻
+        沿用首次出现时间作为发布时间，skip_known 为真时直接丢弃。
+        """
+        now = time.time()
+        run_seen = set()
+        rows = []
+        results = {}
+        known_count = 0
+
+        for category, items in categorized_items.items():
+            unique_items = []
+
+            for item in items:
+                item_id = item.get('id')
+                if not item_id or item_id in run_seen:
+                    continue
+                run_seen.add(item_id)
+
+                first_seen = self._first_seen.get(item_id)
+                if first_seen is None:
+                    # 首次出现时间取新闻自身的发布时间，下次运行沿用时发布时间不变
+                    first_seen = NewsUtils.item_timestamp(item)
+                    if first_seen is None:
+                        first_seen = now
+                        item['published_at'] = datetime.fromtimestamp(first_seen).isoformat()
+                        item['published_ts'] = first_seen
+                    self._first_seen[item_id] = first_seen
+                    rows.append((item_id, item.get('link'), category, first_seen, now))
+                else:
+                    known_count += 1
+                    rows.append((item_id, item.get('link'), category, first_seen, now))
+                    if skip_known:
+                        continue
+                    item['published_at'] = datetime.fromtimestamp(first_seen).isoformat()
+                    item['published_ts'] = first_seen
+
+                unique_items.append(item)
+
+            results[category] = unique_items
+
+        self.conn.executemany(
+            "INSERT INTO seen_items (id, link, category, first_seen, last_seen) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET last_seen = excluded.last_seen",
+            rows
+        )
+        self.conn.commit()
+
+        self.logger.info(f"跨运行去重: {len(run_seen)} 条新闻，其中 {known_count} 条以前已出现")
+        return results
+
+    def close(self):
+        """关闭数据库连接"""
+        self.conn.close()
@@ -0,0 +1,157 @@
+"""新闻源健康状态模块"""
+import logging
+import math
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .utils import NewsUtils
+
+
+class SourceHealth:
+    """按源记录的健康状态：熔断器和自适应超时
+
+    每个源（按URL）保存连续失败次数、熔断打开时间和最近若干次成功请求的耗时，
+    持久化在 data_dir/source_health.json，跨运行生效：
+
+    - 连续 failure_threshold 次运行抓取失败后熔断打开，cooldown 秒内直接跳过该源；
+      冷却结束后放行一次试探请求（不重试），成功则关闭熔断，失败则重新计时。
+    - 单次请求的超时时间取最近耗时的 p95 乘以 timeout_multiplier，限制在
+      [min_timeout, 配置的 timeout] 之间；样本不足 min_samples 时使用配置的 timeout。
+    """
+
+    # 延迟直方图的桶上限（秒）
+    BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+
+    def __init__(self, state_file: str, circuit_config: Optional[Dict[str, Any]] = None,
+                 timeout_config: Optional[Dict[str, Any]] = None):
+        self.state_file = Path(state_file)
+        self.logger = logging.getLogger(__name__)
+
+        circuit_config = circuit_config or {}
+        self.circuit_enabled = circuit_config.get('enabled', True)
+        self.failure_threshold = max(circuit_config.get('failure_threshold', 3), 1)
+        self.cooldown = circuit_config.get('cooldown', 1800)
+
+        timeout_config = timeout_config or {}
+        self.adaptive_timeout = timeout_config.get('enabled', True)
+        self.timeout_multiplier = timeout_config.get('multiplier', 3)
+        self.min_timeout = timeout_config.get('min_timeout', 5)
+        self.min_samples = timeout_config.get('min_samples', 5)
+        self.window = timeout_config.get('window', 50)
+
+        # URL -> {failures, opened_at, latencies}
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        if self.state_file.exists():
+            self.sources = NewsUtils.load_json_file(str(self.state_file))
+
+        # 本次运行中处于试探状态的源
+        self._probing = set()
+
+    def _entry(self, url: str) -> Dict[str, Any]:
+        if url not in self.sources:
+            self.sources[url] = {'failures': 0, 'opened_at': None, 'latencies': []}
+        return self.sources[url]
+
+    def state(self, url: str) -> str:
+        """熔断器状态：closed / open / half_open"""
+        entry = self.sources.get(url)
+        if not entry or not entry.get('opened_at'):
+            return 'closed'
+        if time.time() - entry['opened_at'] < self.cooldown:
+            return 'open'
+        return 'half_open'
+
+    def allow(self, url: str) -> bool:
+        """是否允许请求该源；熔断打开期间返回 False"""
+        if not self.circuit_enabled:
+            return True
+
+        state = self.state(url)
+        if state == 'open':
+            return False
+        if state == 'half_open':
+            self._probing.add(url)
+        return True
+
+    def is_probing(self, url: str) -> bool:
+        """冷却结束后的试探请求（失败时不重试）"""
+        return url in self._probing
+
+    def record_success(self, url: str, latency: float):
+        """记录一次成功请求及其耗时"""
+        entry = self._entry(url)
+        if entry.get('opened_at'):
+            self.logger.info(f"源已恢复，关闭熔断: {url}")
+        entry['failures'] = 0
+        entry['opened_at'] = None
+        entry['latencies'] = (entry['latencies'] + [round(latency, 3)])[-self.window:]
+        self._probing.discard(url)
+
+    def record_failure(self, url: str):
+        """记录一次抓取失败（重试全部失败后调用一次）"""
+        entry = self._entry(url)
+        entry['failures'] += 1
+
+        if self.circuit_enabled and (url in self._probing or entry['failures'] >= self.failure_threshold):
+            entry['opened_at'] = time.time()
+            self.logger.warning(
+                f"源连续失败 {entry['failures']} 次，熔断 {self.cooldown} 秒: {url}"
+            )
+        self._probing.discard(url)
+
+    @staticmethod
+    def _percentile(values: List[float], percentile: float) -> Optional[float]:
+        """最近邻法百分位数"""
+        if not values:
+            return None
+        ordered = sorted(values)
+        index = max(math.ceil(percentile / 100 * len(ordered)) - 1, 0)
+        return ordered[index]
+
+    def percentile(self, url: str, percentile: float) -> Optional[float]:
+        """该源最近耗时的百分位数，样本不足 min_samples 时返回 None"""
+        latencies = self.sources.get(url, {}).get('latencies', [])
+        if len(latencies) < self.min_samples:
+            return None
+        return self._percentile(latencies, percentile)
+
+    def timeout_for(self, url: str, default: float) -> float:
+        """该源单次请求的超时时间"""
+        latencies = self.sources.get(url, {}).get('latencies', [])
+        if not self.adaptive_timeout or len(latencies) < self.min_samples:
+            return default
+
+        p95 = self._percentile(latencies, 95)
+        return min(max(p95 * self.timeout_multiplier, self.min_timeout), default)
+
+    def histogram(self, url: str) -> Dict[str, int]:
+        """最近耗时的直方图（各桶不累计，桶名为上限秒数）"""
+        counts = {f"le_{bound}": 0 for bound in self.BUCKETS}
+        counts['le_inf'] = 0
+        for latency in self.sources.get(url, {}).get('latencies', []):
+            for bound in self.BUCKETS:
+                if latency <= bound:
+                    counts[f"le_{bound}"] += 1
+                    break
+            else:
+                counts['le_inf'] += 1
+        return counts
+
+    def report(self, url: str, default_timeout: float) -> Dict[str, Any]:
+        """单个源的健康状态摘要（用于运行统计）"""
+        entry = self.sources.get(url, {})
+        latencies = entry.get('latencies', [])
+        return {
+            'state': self.state(url),
+            'failures': entry.get('failures', 0),
+            'samples': len(latencies),
+            'p50': self._percentile(latencies, 50),
+            'p95': self._percentile(latencies, 95),
+            'timeout': round(self.timeout_for(url, default_timeout), 2),
+            'histogram': self.histogram(url)
+        }
+
+    def save(self):
+        """保存健康状态"""
+        NewsUtils.save_json_file(self.sources, str(self.state_file), indent=None)
@@ -1,6 +1,13 @@
 """工具函数模块"""
+import hashlib
+import heapq
 import json
-from typing import Dict, Any, List
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Any, List, Optional, Iterable, Iterator, IO
 from pathlib import Path
 import logging
 
@@ -30,6 +37,26 @@ class NewsUtils:
             logging.error(f"保存JSON文件失败 {filepath}: {e}")
             return False
     
+    @staticmethod
+    @contextmanager
+    def atomic_write(filepath: str, encoding: str = 'utf-8', mode: str = 'w') -> Iterator[IO]:
+        """原子写入文件
+        
+        先写入同目录下的临时文件，成功后再替换目标文件，读取方不会看到写了一半的文件；
+        写入出错时删除临时文件，目标文件保持原样。mode 为 'wb' 时按二进制写入。
+        """
+        path = Path(filepath)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, mode, encoding=None if 'b' in mode else encoding) as f:
+                yield f
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+    
     @staticmethod
     def get_latest_data_file(data_dir: str = "data") -> str:
         """获取最新的数据文件"""
@@ -101,6 +128,65 @@ class NewsUtils:
         except:
             return "Unknown"
     
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """规范化URL：小写协议和域名，去掉锚点、跟踪参数和末尾斜杠"""
+        from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+        
+        try:
+            parts = urlsplit(url.strip())
+        except ValueError:
+            return url.strip()
+        
+        query = [
+            (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith('utm_') and key.lower() not in ('spm', 'from', 'fbclid', 'gclid')
+        ]
+        path = parts.path.rstrip('/') or '/'
+        
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ''))
+    
+    @staticmethod
+    def stable_id(url: str) -> str:
+        """基于规范化链接的稳定ID（跨进程、跨运行不变）"""
+        return hashlib.sha1(NewsUtils.normalize_url(url).encode('utf-8')).hexdigest()[:16]
+    
+    @staticmethod
+    def parse_timestamp(iso_time: Optional[str]) -> Optional[float]:
+        """把ISO时间字符串解析为时间戳，失败返回 None"""
+        if not iso_time:
+            return None
+        
+        try:
+            return datetime.fromisoformat(iso_time.replace('Z', '+00:00')).timestamp()
+        except (ValueError, TypeError, AttributeError):
+            return None
+    
+    @staticmethod
+    def item_timestamp(item: Dict[str, Any]) -> Optional[float]:
+        """获取新闻项的发布时间戳
+        
+        解析阶段已预先计算 published_ts；缺失时（如旧缓存中的新闻项）才解析
+        published_at，并把结果写回新闻项，后续阶段不再重复解析。
+        """
+        if 'published_ts' not in item:
+            item['published_ts'] = NewsUtils.parse_timestamp(item.get('published_at'))
+        return item['published_ts']
+    
+    @staticmethod
+    def merge_sorted_items(item_lists: Iterable[List[Dict[str, Any]]], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """k路归并多个已按发布时间倒序排列的新闻列表，取前 limit 条
+        
+        各分类列表已由 sort_items 排好序，合并只需 O(k·limit)，无需重新全量排序。
+        没有发布时间的新闻与 sort_items 一致，视为最新。
+        """
+        def get_sort_key(item):
+            published_ts = NewsUtils.item_timestamp(item)
+            return float('inf') if published_ts is None else published_ts
+        
+        merged = heapq.merge(*item_lists, key=get_sort_key, reverse=True)
+        return list(islice(merged, limit) if limit else merged)
+    
     @staticmethod
     def truncate_text(text: str, max_length: int = 200, suffix: str = "...") -> str:
         """截断文本"""
@@ -4,15 +4,14 @@ import asyncio
 import sys
 from pathlib import Path
 
-# 添加src目录到Python路径
-src_path = Path(__file__).parent / "src"
-sys.path.insert(0, str(src_path))
+# 添加项目根目录到Python路径
+sys.path.insert(0, str(Path(__file__).parent))
 
-from config import Config
-from fetcher import NewsFetcher
-from parser import NewsParser
-from rss_generator import RSSGenerator
-from html_generator import HTMLGenerator
+from src.config import Config
+from src.fetcher import NewsFetcher
+from src.parser import NewsParser
+from src.rss_generator import RSSGenerator
+from src.html_generator import HTMLGenerator
 
 
 async def test_local():